@@ -1,16 +1,33 @@
 #!/usr/bin/env python3
 
 import argparse
+import copy
+import functools
 import sys
 import os
 import logging
 from pathlib import Path
+from stat import S_IMODE
+from types import MappingProxyType
 import yaml
 import json
 import traceback
-from timescaledb_report import connect_to_db, generate_markdown
+from timescaledb_report import generate_markdown
 from timescaledb_report.strings import get_string
-from timescaledb_report.html import generate_html_report
+from timescaledb_report.html import generate_html_report_from_string
+from timescaledb_report.db import open_pool, close_pools
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjson is optional; it parses JSON configs faster than the stdlib
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # Setup logging
 logging.basicConfig(
@@ -19,14 +36,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger('run')
 
-# Default database connection parameters
-DEFAULT_DB_PARAMS = {
+# Default database connection parameters (read-only); the password has no
+# default and must come from the command line, a config file or PGPASSWORD
+DEFAULT_DB_PARAMS = MappingProxyType({
     'dbname': 'jettison',
     'user': 'jettison',
-    'password': 'aMvzpGPgNVtH53S',
     'host': '172.23.90.145',
     'port': 8094
-}
+})
+
+# Read once at startup rather than on every merge
+_PGPASSWORD = os.environ.get('PGPASSWORD')
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -71,6 +91,72 @@ def parse_args():
 
     return parser.parse_args()
 
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(path, mtime_ns, size):
+    """Parse a config file; mtime and size are part of the cache key only"""
+    path = Path(path)
+    if path.suffix in ['.yaml', '.yml']:
+        return _load_yaml_with_sidecar(path, mtime_ns, size)
+    return _json_loads(path.read_bytes())
+
+def _load_yaml_with_sidecar(path, mtime_ns, size):
+    """Load a YAML config, reusing a JSON sidecar cache when it is up to date
+
+    The sidecar records the modification time and size of the YAML it was
+    written from and is only used when both still match exactly.
+
+    Args:
+        path (Path): Path to the YAML config
+        mtime_ns (int): Modification time of the YAML in nanoseconds
+        size (int): Size of the YAML in bytes
+
+    Returns:
+        dict: The parsed configuration
+    """
+    sidecar = Path(str(path) + '.cache.json')
+    source = [mtime_ns, size]
+
+    # JSON parses much faster than YAML, so prefer a sidecar that isn't stale
+    try:
+        cached = _json_loads(sidecar.read_bytes())
+        if cached.get('source') == source:
+            return cached['data']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+
+    # Serialize before opening so a non-JSON value can't leave a broken sidecar
+    try:
+        serialized = json.dumps({'source': source, 'data': data})
+    except (TypeError, ValueError) as e:
+        logger.debug(f"Not writing config cache {sidecar}: {e}")
+        return data
+
+    # JSON turns non-string keys into strings; don't cache data it can't round-trip
+    if json.loads(serialized)['data'] != data:
+        logger.debug(f"Not writing config cache {sidecar}: config does not round-trip through JSON")
+        return data
+
+    # The config may hold the database password, so the sidecar is never
+    # readable by more users than the YAML, and is written whole or not at all
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        mode = S_IMODE(path.stat().st_mode) & 0o600
+        fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, mode)
+        with os.fdopen(fd, 'w') as f:
+            f.write(serialized)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.debug(f"Not writing config cache {sidecar}: {e}")
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+    return data
+
 def load_config(config_path):
     """Load configuration from a YAML or JSON file"""
     if not config_path:
@@ -81,25 +167,23 @@ def load_config(config_path):
         logger.error(get_string("cli.config_not_found", "Config file not found: {path}", path=config_path))
         return {}
 
+    if path.suffix not in ['.yaml', '.yml', '.json']:
+        logger.error(get_string("cli.unsupported_format",
+                                "Unsupported config file format: {suffix}",
+                                suffix=path.suffix))
+        return {}
+
     try:
-        if path.suffix in ['.yaml', '.yml']:
-            with open(path, 'r') as f:
-                return yaml.safe_load(f)
-        elif path.suffix == '.json':
-            with open(path, 'r') as f:
-                return json.load(f)
-        else:
-            logger.error(get_string("cli.unsupported_format",
-                                    "Unsupported config file format: {suffix}",
-                                    suffix=path.suffix))
-            return {}
+        stat = path.stat()
+        # Callers get their own copy so changes can't leak into the cache
+        return copy.deepcopy(_load_config_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size))
     except Exception as e:
         logger.error(get_string("cli.error_loading_config", "Error loading config: {error}", error=e))
         return {}
 
 def merge_db_params(args, config):
     """Merge DB parameters from config file and command-line args"""
-    db_params = DEFAULT_DB_PARAMS.copy()
+    db_params = dict(DEFAULT_DB_PARAMS)
 
     # Update from config if it exists
     if config and 'database' in config:
@@ -118,8 +202,8 @@ def merge_db_params(args, config):
         db_params['password'] = args.password
 
     # Check for password in environment variable
-    if 'PGPASSWORD' in os.environ and not args.password:
-        db_params['password'] = os.environ['PGPASSWORD']
+    if _PGPASSWORD and not args.password:
+        db_params['password'] = _PGPASSWORD
 
     return db_params
 
@@ -140,51 +224,32 @@ def main():
     output_file = args.output
 
     try:
-        # Test connection first
-        test_conn = connect_to_db(db_params)
-        test_conn.close()
+        # Open the pool first; its initial connection is the connection test
+        open_pool(db_params)
         logger.info(get_string("cli.connection_success",
                               "Successfully connected to database {dbname} at {host}:{port}",
                               dbname=db_params['dbname'],
                               host=db_params['host'],
                               port=db_params['port']))
 
-        # Only generate Markdown if not html-only mode
+        # Generate the report, writing the Markdown file unless in html-only mode
+        md_content = generate_markdown(db_params, None if args.html_only else output_file)
+        if not md_content:
+            logger.error(get_string("cli.report_failure", "Failed to generate schema report"))
+            sys.exit(1)
+
         if not args.html_only:
-            # Generate the report
-            result = generate_markdown(db_params, output_file)
-            if result:
-                logger.info(get_string("cli.report_success",
-                                      "Schema report generated successfully: {file}",
-                                      file=output_file))
-            else:
-                logger.error(get_string("cli.report_failure", "Failed to generate schema report"))
-                sys.exit(1)
-
-        # Generate HTML if requested
+            logger.info(get_string("cli.report_success",
+                                  "Schema report generated successfully: {file}",
+                                  file=output_file))
+
+        # Generate HTML if requested, straight from the in-memory Markdown
         if args.html or args.html_only:
-            if args.html_only:
-                # Generate a temporary markdown file
-                temp_md = f"temp_{db_params['dbname']}.md"
-                result = generate_markdown(db_params, temp_md)
-                if result:
-                    html_file = os.path.splitext(output_file)[0] + '.html'
-                    generate_html_report(temp_md, html_file)
-                    # Remove temporary file
-                    os.remove(temp_md)
-                    logger.info(get_string("cli.html_success",
-                                          "HTML schema report generated successfully: {file}",
-                                          file=html_file))
-                else:
-                    logger.error(get_string("cli.temp_failure",
-                                           "Failed to generate temporary Markdown for HTML report"))
-                    sys.exit(1)
-            else:
-                html_file = os.path.splitext(output_file)[0] + '.html'
-                generate_html_report(output_file, html_file)
-                logger.info(get_string("cli.html_success",
-                                       "HTML schema report generated successfully: {file}",
-                                       file=html_file))
+            html_file = os.path.splitext(output_file)[0] + '.html'
+            generate_html_report_from_string(md_content, html_file)
+            logger.info(get_string("cli.html_success",
+                                   "HTML schema report generated successfully: {file}",
+                                   file=html_file))
 
     except Exception as e:
         logger.error(get_string("log_messages.error_report", "Error generating report: {error}", error=e))
@@ -194,6 +259,8 @@ def main():
             logger.info(get_string("cli.verbose_hint",
                                   "Run with --verbose for more information on this error"))
         sys.exit(1)
+    finally:
+        close_pools()
 
 if __name__ == "__main__":
     main()
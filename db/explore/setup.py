@@ -13,7 +13,7 @@ setup(
         "tabulate>=0.8.10",
         "PyYAML>=6.0",
         "markdown>=3.3.6",
-        "toml>=0.10.2",
+        "tomli>=1.1.0; python_version < '3.11'",
     ],
     entry_points={
         'console_scripts': [
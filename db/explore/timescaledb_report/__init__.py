@@ -7,6 +7,6 @@ simplified schema-focused reports in Markdown format.
 
 from timescaledb_report.db import connect_to_db
 from timescaledb_report.report import generate_markdown
-from timescaledb_report.strings import get_string, load_config, get_config
+from timescaledb_report.strings import get_string, get_string_fast, load_config, get_config
 
 __version__ = "1.2.0"
@@ -4,12 +4,112 @@ Database connection and basic query utilities.
 
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 import sys
+import re
+import itertools
 import logging
+import threading
 from timescaledb_report.strings import get_string
 
 logger = logging.getLogger(__name__)
 
+# Connections per pool; callers running queries in parallel should not use
+# more threads than this, or the extra ones just wait for a connection
+POOL_SIZE = 8
+
+# Connection pools keyed by the connection parameters they were opened with,
+# each with a semaphore counting the connections still free to borrow
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Extension/schema existence results, filled by prefetch_existence_checks and
+# by individual checks; keyed like _pools and then by (kind, name)
+_existence_cache = {}
+
+def _get_pool(db_params):
+    """Get the connection pool for the given parameters, creating it on first use
+
+    All POOL_SIZE connections are opened up front and stay open when
+    returned, so each keeps its prepared statements for the whole run.
+
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        tuple: The ThreadedConnectionPool and its BoundedSemaphore of free connections
+    """
+    key = frozenset(db_params.items())
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry is None:
+            pool = psycopg2.pool.ThreadedConnectionPool(POOL_SIZE, POOL_SIZE, **db_params)
+            entry = _pools[key] = (pool, threading.BoundedSemaphore(POOL_SIZE))
+        return entry
+
+def open_pool(db_params):
+    """Open the connection pool for a report run, verifying the connection
+
+    The pool connects immediately, so this doubles as the connection test
+    and leaves the connections warm for the first queries.
+
+    Args:
+        db_params (dict): Database connection parameters
+
+    Raises:
+        SystemExit: If connection fails
+    """
+    try:
+        _get_pool(db_params)
+    except Exception as e:
+        logger.error(get_string("log_messages.error_connecting",
+                               "Error connecting to the database: {error}",
+                               error=e))
+        sys.exit(1)
+
+def _get_connection(db_params):
+    """Borrow a connection from the pool for the given parameters
+
+    Blocks until a connection is free rather than letting the pool raise
+    PoolError when all of them are in use.
+    """
+    pool, free = _get_pool(db_params)
+    free.acquire()
+    try:
+        return pool.getconn()
+    except BaseException:
+        free.release()
+        raise
+
+def _release_connection(db_params, conn):
+    """Return a borrowed connection to its pool
+
+    Any open transaction is rolled back first so the next borrower starts
+    clean; connections that can't be rolled back are discarded.
+    """
+    broken = bool(conn.closed)
+    if not broken:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+    pool, free = _get_pool(db_params)
+    try:
+        pool.putconn(conn, close=broken)
+    finally:
+        free.release()
+    # A discarded connection takes its prepared statements with it
+    if conn.closed:
+        _prepared.pop(conn, None)
+
+def close_pools():
+    """Close all pooled connections"""
+    with _pools_lock:
+        for pool, _ in _pools.values():
+            pool.closeall()
+        _pools.clear()
+    _prepared.clear()
+
 def connect_to_db(db_params):
     """Establish connection to the TimescaleDB database
 
@@ -31,29 +131,45 @@ def connect_to_db(db_params):
                                error=e))
         sys.exit(1)
 
-def safe_query(db_params, query, params=None):
+def _normalize_params(params):
+    """Coerce query parameters into a tuple, mapping empty strings to None"""
+    if params is None:
+        params = ()
+    # Handle edge cases - ensure params is a tuple or list
+    if not isinstance(params, (tuple, list)):
+        params = (params,)
+    # If we have an empty string, make it None
+    return tuple(p if p != '' else None for p in params)
+
+def _cursor_factory(row_factory):
+    """Map a ``row_factory`` of ``dict`` or ``tuple`` to a psycopg2 cursor factory"""
+    if row_factory is dict:
+        return psycopg2.extras.RealDictCursor
+    if row_factory is tuple:
+        return None
+    raise ValueError(f"Unsupported row_factory: {row_factory!r}")
+
+def safe_query(db_params, query, params=None, row_factory=dict):
     """Safely execute a query that might fail if tables/views don't exist
 
     Args:
         db_params (dict): Database connection parameters
         query (str): SQL query to execute
         params (tuple, optional): Parameters for the query
+        row_factory (type): ``dict`` for rows keyed by column name, or
+            ``tuple`` for plain tuples, which skips building a dict per row
 
     Returns:
-        list: Query results as a list of dictionaries
+        list: Query results as a list of dictionaries (or tuples)
     """
-    # Create a new connection for each query to avoid transaction issues
+    cursor_factory = _cursor_factory(row_factory)
+
+    # Borrow a pooled connection; it is rolled back on release to avoid transaction issues
     new_conn = None
     try:
-        new_conn = psycopg2.connect(**db_params)
-        with new_conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
-            if params is None:
-                params = ()
-            # Handle edge cases - ensure params is a tuple or list
-            if not isinstance(params, (tuple, list)):
-                params = (params,)
-            # If we have an empty string, make it None
-            params = tuple(p if p != '' else None for p in params)
+        new_conn = _get_connection(db_params)
+        with new_conn.cursor(cursor_factory=cursor_factory) as cur:
+            params = _normalize_params(params)
 
             logger.debug(f"Executing query: {query}")
             logger.debug(f"With parameters: {params}")
@@ -61,6 +177,9 @@ def safe_query(db_params, query, params=None):
             cur.execute(query, params)
             result = cur.fetchall()
         return result
+    except psycopg2.pool.PoolError:
+        # A pool problem is not a query failure; don't report it as no rows
+        raise
     except psycopg2.Error as e:
         if "relation" in str(e) and "does not exist" in str(e):
             return []
@@ -81,70 +200,346 @@ def safe_query(db_params, query, params=None):
     finally:
         if new_conn:
             try:
-                new_conn.close()
+                _release_connection(db_params, new_conn)
             except Exception:
                 pass
 
-def check_if_extension_exists(db_params, extension_name):
-    """Check if a specific PostgreSQL extension exists
+def safe_query_iter(db_params, query, params=None, itersize=2000, row_factory=dict):
+    """Stream the results of a query that might fail if tables/views don't exist
+
+    Rows are fetched through a server-side cursor in batches of ``itersize``,
+    so memory stays bounded however large the result set is. Errors are
+    logged and end the iteration, like ``safe_query`` returning ``[]``.
 
     Args:
         db_params (dict): Database connection parameters
-        extension_name (str): Name of the extension to check
+        query (str): SQL query to execute
+        params (tuple, optional): Parameters for the query
+        itersize (int): Number of rows fetched per round-trip
+        row_factory (type): ``dict`` or ``tuple``, as for ``safe_query``
+
+    Yields:
+        dict: Query result rows (or tuples)
+    """
+    cursor_factory = _cursor_factory(row_factory)
+
+    new_conn = None
+    try:
+        new_conn = _get_connection(db_params)
+        with new_conn.cursor(name='safe_query_iter', cursor_factory=cursor_factory) as cur:
+            cur.itersize = itersize
+            params = _normalize_params(params)
+
+            logger.debug(f"Streaming query: {query}")
+            logger.debug(f"With parameters: {params}")
+
+            cur.execute(query, params)
+            for row in cur:
+                yield row
+    except psycopg2.pool.PoolError:
+        raise
+    except psycopg2.Error as e:
+        if not ("relation" in str(e) and "does not exist" in str(e)):
+            logger.warning(get_string("log_messages.query_error",
+                                      "Query error: {error}",
+                                      error=e))
+    finally:
+        if new_conn:
+            try:
+                _release_connection(db_params, new_conn)
+            except Exception:
+                pass
+
+# Server-side prepared statements per pooled connection: {conn: {sql: name}}
+# Entries are dropped when their connection is closed
+_prepared = {}
+
+_PLACEHOLDER_RE = re.compile(r'%[%s]')
+
+def _to_positional(query):
+    """Rewrite psycopg2 ``%s`` placeholders as ``$1, $2, ...`` for PREPARE"""
+    counter = itertools.count(1)
+    return _PLACEHOLDER_RE.sub(
+        lambda m: '%' if m.group() == '%%' else f'${next(counter)}', query)
+
+def _prepare(conn, stmt_name, query):
+    """Prepare a query on a connection unless it already was
+
+    Args:
+        conn: Borrowed database connection
+        stmt_name (str): Short name used as the statement name prefix
+        query (str): SQL query with psycopg2 placeholders
 
     Returns:
-        bool: True if the extension exists, False otherwise
+        str: Server-side name of the prepared statement
     """
-    # Use a separate connection to avoid transaction issues
+    statements = _prepared.get(conn)
+    if statements is None:
+        statements = _prepared[conn] = {}
+        # A generic plan can't exclude hypertable chunks on parameter values,
+        # and TimescaleDB is known to regress badly once PostgreSQL switches a
+        # prepared statement over to one. Always plan with the actual values.
+        # Committed so that the rollback on release does not undo it.
+        with conn.cursor() as cur:
+            try:
+                cur.execute("SET plan_cache_mode = force_custom_plan")
+                conn.commit()
+            except psycopg2.Error:
+                # plan_cache_mode only exists on PostgreSQL 12+
+                conn.rollback()
+
+    name = statements.get(query)
+    if name is None:
+        # Numbered so that dynamic SQL sharing a prefix gets distinct names
+        name = f"{stmt_name}_{len(statements)}"
+        with conn.cursor() as cur:
+            cur.execute(f"PREPARE {name} AS {_to_positional(query)}")
+        conn.commit()
+        statements[query] = name
+    return name
+
+def prepared_query(db_params, stmt_name, query, params=None, row_factory=dict):
+    """Execute a repeated query as a server-side prepared statement
+
+    Behaves like ``safe_query``, but the query is parsed and prepared only
+    once per pooled connection; later calls just EXECUTE it with new
+    parameters.
+
+    Args:
+        db_params (dict): Database connection parameters
+        stmt_name (str): Stable short name for the statement
+        query (str): SQL query to execute
+        params (tuple, optional): Parameters for the query
+        row_factory (type): ``dict`` or ``tuple`` rows, as for ``safe_query``
+
+    Returns:
+        list: Query results or empty list on error
+    """
+    cursor_factory = _cursor_factory(row_factory)
+
     new_conn = None
     try:
-        new_conn = psycopg2.connect(**db_params)
-        with new_conn.cursor() as cur:
-            cur.execute("SELECT 1 FROM pg_extension WHERE extname = %s;", (extension_name,))
-            result = cur.fetchone()
-        return result is not None
+        new_conn = _get_connection(db_params)
+        params = _normalize_params(params)
+        name = _prepare(new_conn, stmt_name, query)
+
+        logger.debug(f"Executing prepared query {name}: {query}")
+        logger.debug(f"With parameters: {params}")
+
+        with new_conn.cursor(cursor_factory=cursor_factory) as cur:
+            if params:
+                cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})",
+                            params)
+            else:
+                cur.execute(f"EXECUTE {name}")
+            return cur.fetchall()
+    except psycopg2.pool.PoolError:
+        raise
     except psycopg2.Error as e:
-        logger.warning(get_string("log_messages.error_extension",
-                                 "Error checking extension: {error}",
+        if not ("relation" in str(e) and "does not exist" in str(e)):
+            logger.warning(get_string("log_messages.query_error",
+                                      "Query error: {error}",
+                                      error=e))
+        return []
+    except Exception as e:
+        logger.warning(get_string("log_messages.unexpected_error",
+                                 "Unexpected error during query: {error}",
                                  error=e))
+        return []
+    finally:
+        if new_conn:
+            try:
+                _release_connection(db_params, new_conn)
+            except Exception:
+                pass
+
+# Output formats accepted by copy_query_to_file
+COPY_FORMATS = ('binary', 'csv', 'text')
+
+def copy_query_to_file(db_params, query, path, params=None, copy_format='binary'):
+    """Export the result of a query to a file with COPY instead of fetching rows
+
+    COPY streams the result straight from the server without building Python
+    rows. FORMAT BINARY also skips text conversion on both sides and is the
+    best fit for numeric-heavy data; use 'csv' when the file must be readable
+    by other tools.
+
+    Args:
+        db_params (dict): Database connection parameters
+        query (str): SELECT query whose result is exported
+        path (str): Output file path
+        params (tuple, optional): Parameters for the query
+        copy_format (str): One of COPY_FORMATS
+
+    Returns:
+        bool: True if the export succeeded, False otherwise
+    """
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"Unsupported COPY format: {copy_format}")
+
+    new_conn = None
+    try:
+        new_conn = _get_connection(db_params)
+        with new_conn.cursor() as cur:
+            # COPY can't take bind parameters, so inline them safely first
+            inner = cur.mogrify(query, _normalize_params(params)).decode()
+            copy_sql = f"COPY ({inner}) TO STDOUT WITH (FORMAT {copy_format})"
+
+            logger.debug(f"Copying query to {path}: {copy_sql}")
+
+            with open(path, 'wb') as f:
+                cur.copy_expert(copy_sql, f)
+        return True
+    except psycopg2.pool.PoolError:
+        raise
+    except (psycopg2.Error, OSError) as e:
+        logger.warning(get_string("log_messages.query_error",
+                                  "Query error: {error}",
+                                  error=e))
         return False
     finally:
         if new_conn:
             try:
-                new_conn.close()
+                _release_connection(db_params, new_conn)
             except Exception:
                 pass
 
-def check_if_schema_exists(db_params, schema_name):
-    """Check if a specific schema exists
+# Existence queries by kind: (query taking one array parameter, error string key, default)
+_EXISTENCE_QUERIES = {
+    'extension': ("SELECT extname FROM pg_extension WHERE extname = ANY(%s);",
+                  "log_messages.error_extension",
+                  "Error checking extension: {error}"),
+    'schema': ("SELECT schema_name FROM information_schema.schemata WHERE schema_name = ANY(%s);",
+               "log_messages.error_schema",
+               "Error checking schema: {error}")
+}
+
+def _existence_query(db_params, kind, names):
+    """Run an existence query for several names in one round-trip
 
     Args:
         db_params (dict): Database connection parameters
-        schema_name (str): Name of the schema to check
+        kind (str): 'extension' or 'schema'
+        names (iterable): Names to look for
 
     Returns:
-        bool: True if the schema exists, False otherwise
+        set: The subset of names that exist, or None if the query failed
     """
-    # Use a separate connection to avoid transaction issues
+    query, error_key, error_default = _EXISTENCE_QUERIES[kind]
+
+    # Borrow a pooled connection; it is rolled back on release to avoid transaction issues
     new_conn = None
     try:
-        new_conn = psycopg2.connect(**db_params)
+        new_conn = _get_connection(db_params)
         with new_conn.cursor() as cur:
-            cur.execute("SELECT 1 FROM information_schema.schemata WHERE schema_name = %s;", (schema_name,))
-            result = cur.fetchone()
-        return result is not None
+            cur.execute(query, (list(names),))
+            return {row[0] for row in cur.fetchall()}
+    except psycopg2.pool.PoolError:
+        raise
     except psycopg2.Error as e:
-        logger.warning(get_string("log_messages.error_schema",
-                                 "Error checking schema: {error}",
-                                 error=e))
-        return False
+        logger.warning(get_string(error_key, error_default, error=e))
+        return None
     finally:
         if new_conn:
             try:
-                new_conn.close()
+                _release_connection(db_params, new_conn)
             except Exception:
                 pass
 
+def _cached_exists(db_params, kind, name):
+    """Check whether an extension or schema exists, querying each name once per database
+
+    Failed lookups are reported as missing but not cached, so a transient
+    error doesn't stick for the rest of the run.
+    """
+    cache = _existence_cache.setdefault(frozenset(db_params.items()), {})
+    exists = cache.get((kind, name))
+    if exists is None:
+        found = _existence_query(db_params, kind, [name])
+        if found is None:
+            return False
+        exists = name in found
+        cache[(kind, name)] = exists
+    return exists
+
+def clear_existence_cache():
+    """Forget cached extension/schema existence and version results"""
+    _existence_cache.clear()
+
+def prefetch_existence_checks(db_params, extension_names=(), schema_names=()):
+    """Look up extensions and schemas up front so later checks need no round-trip
+
+    Extension versions are fetched along with them, so
+    ``get_timescaledb_version`` is answered from the same cache. Names that
+    are already cached are not looked up again.
+
+    Args:
+        db_params (dict): Database connection parameters
+        extension_names (iterable): Extensions that will be checked later
+        schema_names (iterable): Schemas that will be checked later
+    """
+    cache = _existence_cache.setdefault(frozenset(db_params.items()), {})
+    extension_names = [name for name in extension_names
+                       if ('extension', name) not in cache or ('version', name) not in cache]
+    schema_names = [name for name in schema_names if ('schema', name) not in cache]
+    if not extension_names and not schema_names:
+        return
+
+    new_conn = None
+    try:
+        new_conn = _get_connection(db_params)
+        with new_conn.cursor() as cur:
+            cur.execute("""
+                SELECT 'extension', extname, extversion FROM pg_extension WHERE extname = ANY(%s)
+                UNION ALL
+                SELECT 'schema', schema_name, NULL FROM information_schema.schemata WHERE schema_name = ANY(%s);
+            """, (extension_names, schema_names))
+            rows = cur.fetchall()
+    except psycopg2.pool.PoolError:
+        raise
+    except psycopg2.Error as e:
+        # Leave the cache alone; individual checks will query on demand
+        logger.warning(get_string("log_messages.query_error", "Query error: {error}", error=e))
+        return
+    finally:
+        if new_conn:
+            try:
+                _release_connection(db_params, new_conn)
+            except Exception:
+                pass
+
+    found = {(kind, name) for kind, name, _ in rows}
+    versions = {name: version for kind, name, version in rows if kind == 'extension'}
+    for name in extension_names:
+        cache[('extension', name)] = ('extension', name) in found
+        cache[('version', name)] = versions.get(name)
+    for name in schema_names:
+        cache[('schema', name)] = ('schema', name) in found
+
+def check_if_extension_exists(db_params, extension_name):
+    """Check if a specific PostgreSQL extension exists
+
+    Args:
+        db_params (dict): Database connection parameters
+        extension_name (str): Name of the extension to check
+
+    Returns:
+        bool: True if the extension exists, False otherwise
+    """
+    return _cached_exists(db_params, 'extension', extension_name)
+
+def check_if_schema_exists(db_params, schema_name):
+    """Check if a specific schema exists
+
+    Args:
+        db_params (dict): Database connection parameters
+        schema_name (str): Name of the schema to check
+
+    Returns:
+        bool: True if the schema exists, False otherwise
+    """
+    return _cached_exists(db_params, 'schema', schema_name)
+
 def get_database_size_info(db_params):
     """Get database size information
     
@@ -188,14 +583,23 @@ def get_timescaledb_version(db_params):
     if not check_if_extension_exists(db_params, 'timescaledb'):
         return None
 
-    # Use a separate connection to avoid transaction issues
+    # The version can't change during a run; cache it next to the existence checks
+    cache = _existence_cache.setdefault(frozenset(db_params.items()), {})
+    if ('version', 'timescaledb') in cache:
+        return cache[('version', 'timescaledb')]
+
+    # Borrow a pooled connection; it is rolled back on release to avoid transaction issues
     new_conn = None
     try:
-        new_conn = psycopg2.connect(**db_params)
+        new_conn = _get_connection(db_params)
         with new_conn.cursor() as cur:
             cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'timescaledb';")
             result = cur.fetchone()
-        return result[0] if result else None
+        version = result[0] if result else None
+        cache[('version', 'timescaledb')] = version
+        return version
+    except psycopg2.pool.PoolError:
+        raise
     except psycopg2.Error as e:
         logger.warning(get_string("log_messages.error_version",
                                  "Error getting TimescaleDB version: {error}",
@@ -204,6 +608,6 @@ def get_timescaledb_version(db_params):
     finally:
         if new_conn:
             try:
-                new_conn.close()
+                _release_connection(db_params, new_conn)
             except Exception:
                 pass
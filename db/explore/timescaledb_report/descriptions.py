@@ -6,11 +6,85 @@ columns, indices, and other database components. It loads descriptions from the
 TOML configuration file.
 """
 
+import functools
 import logging
-from timescaledb_report.strings import get_string
+import re
+from timescaledb_report.strings import get_string_fast, get_config
 
 logger = logging.getLogger(__name__)
 
+# Substring patterns in priority order; the first one with a configured purpose wins
+COLUMN_TYPE_PATTERNS = ["jsonb", "json", "uuid", "boolean"]
+COLUMN_NAME_PATTERNS = ["id", "json", "timestamp", "created_at", "updated_at", "is_", "has_"]
+INDEX_NAME_PATTERNS = ["gin", "time_idx", "pkey"]
+INDEX_MULTI_PATTERNS = ["time_", "_time", "service_category", "error_"]
+INDEX_COLUMN_PATTERNS = ["time", "severity", "level", "status"]
+
+# Matches the trailing _<chunk id>_chunk of a TimescaleDB chunk table name
+_CHUNK_SUFFIX_RE = re.compile(r'_\d+_chunk$')
+
+# Purpose lookup tables built from the configuration on first use
+_lookups = None
+
+def _compile_patterns(purposes, patterns):
+    """Compile the configured patterns into one regex that honours their priority
+
+    Each alternative is a lookahead anchored at the start of the string, so
+    alternation order (pattern priority) decides the winner rather than the
+    leftmost match position.
+
+    Args:
+        purposes (dict): Configured purposes keyed by pattern
+        patterns (list): Patterns in priority order; unconfigured ones are skipped
+
+    Returns:
+        tuple: (compiled regex or None, purposes indexed by group number - 1)
+    """
+    ordered = [pattern for pattern in patterns if purposes.get(pattern)]
+    if not ordered:
+        return None, ()
+    alternatives = '|'.join(f'(?=.*?({re.escape(pattern)}))' for pattern in ordered)
+    return re.compile(f'^(?:{alternatives})', re.DOTALL), tuple(purposes[pattern] for pattern in ordered)
+
+def _match_purpose(compiled, text):
+    """Return the purpose of the highest-priority pattern found in text, or None"""
+    regex, purposes = compiled
+    if regex is None:
+        return None
+    m = regex.match(text)
+    return purposes[m.lastindex - 1] if m else None
+
+def _get_lookups():
+    """Get the purpose lookup tables, building them from the configuration once
+
+    Returns:
+        dict: Exact-match dicts and compiled pattern tables for columns and indexes
+    """
+    global _lookups
+    if _lookups is None:
+        config = get_config()
+        column_purposes = config.get('column_purposes', {})
+        index_purposes = config.get('index_purposes', {})
+        _lookups = {
+            'specific_columns': config.get('specific_column_purposes', {}),
+            'exact_columns': column_purposes.get('exact', {}),
+            'column_types': _compile_patterns(column_purposes.get('type', {}), COLUMN_TYPE_PATTERNS),
+            'column_names': _compile_patterns(column_purposes.get('pattern', {}), COLUMN_NAME_PATTERNS),
+            'index_names': _compile_patterns(index_purposes.get('name', {}), INDEX_NAME_PATTERNS),
+            'index_multi': _compile_patterns(index_purposes.get('multi', {}), INDEX_MULTI_PATTERNS),
+            'index_columns': _compile_patterns(index_purposes.get('columns', {}), INDEX_COLUMN_PATTERNS),
+        }
+    return _lookups
+
+def clear_purpose_caches():
+    """Forget memoized purposes so a reloaded strings configuration takes effect"""
+    global _lookups
+    _lookups = None
+    get_table_purpose.cache_clear()
+    _get_column_purpose.cache_clear()
+    _get_index_purpose.cache_clear()
+
+@functools.lru_cache(maxsize=4096)
 def get_table_purpose(table_name):
     """Get the purpose description for a table
 
@@ -25,8 +99,8 @@ def get_table_purpose(table_name):
         return "Log entries streamed from Redis for applications and services"
 
     # Try to get specific table purpose, fall back to default
-    purpose = get_string(f"table_purposes.{table_name}",
-                         default=get_string("table_purposes.default", "Data storage"))
+    purpose = get_string_fast(f"table_purposes.{table_name}",
+                              default=get_string_fast("table_purposes.default", "Data storage"))
     return purpose
 
 def get_column_purpose(table_name, column_name, data_type):
@@ -55,30 +129,34 @@ def get_column_purpose(table_name, column_name, data_type):
             return "Actual log message content extracted from the data JSON"
 
     # Check for specific table-column override first
-    specific_purpose = get_string(f"specific_column_purposes.{table_name}.{column_name}")
+    specific_purpose = _get_lookups()['specific_columns'].get(table_name, {}).get(column_name)
     if specific_purpose:
         return specific_purpose
 
+    # The rest depends only on the column, so it is shared by every table
+    return _get_column_purpose(column_name, data_type)
+
+@functools.lru_cache(maxsize=4096)
+def _get_column_purpose(column_name, data_type):
+    """Determine the purpose of a column from its name and type alone"""
+    lookups = _get_lookups()
+
     # Check for exact column name match
-    exact_purpose = get_string(f"column_purposes.exact.{column_name}")
+    exact_purpose = lookups['exact_columns'].get(column_name)
     if exact_purpose:
         return exact_purpose
 
     # Check for data type matches
     data_type_lower = data_type.lower()
-    for type_pattern in ["jsonb", "json", "uuid", "boolean"]:
-        if type_pattern in data_type_lower:
-            type_purpose = get_string(f"column_purposes.type.{type_pattern}")
-            if type_purpose:
-                return type_purpose
+    type_purpose = _match_purpose(lookups['column_types'], data_type_lower)
+    if type_purpose:
+        return type_purpose
 
     # Check for pattern matches
     column_name_lower = column_name.lower()
-    for pattern in ["id", "json", "timestamp", "created_at", "updated_at", "is_", "has_"]:
-        if pattern in column_name_lower:
-            pattern_purpose = get_string(f"column_purposes.pattern.{pattern}")
-            if pattern_purpose:
-                return pattern_purpose
+    pattern_purpose = _match_purpose(lookups['column_names'], column_name_lower)
+    if pattern_purpose:
+        return pattern_purpose
 
     # Default empty if no match found
     return ""
@@ -87,6 +165,10 @@ def get_index_purpose(index_name, columns, is_primary, is_unique, table_name):
     """
     Determine the purpose of an index based on patterns
 
+    Chunk indexes are assumed to carry the same meaning as the hypertable
+    index they were created from, so every chunk of a hypertable shares one
+    cached result.
+
     Args:
         index_name (str): Name of the index
         columns (str): Comma-separated list of columns in the index
@@ -97,11 +179,37 @@ def get_index_purpose(index_name, columns, is_primary, is_unique, table_name):
     Returns:
         str: Description of the index's purpose
     """
+    # Chunks are named _hyper_<hypertable id>_<chunk id>_chunk and their index
+    # names are the hypertable index names prefixed with the chunk name
+    if _CHUNK_SUFFIX_RE.search(table_name):
+        if index_name.startswith(table_name + '_'):
+            index_name = index_name[len(table_name) + 1:]
+        table_name = _CHUNK_SUFFIX_RE.sub('', table_name)
+
+    # Only the kind of table affects the purpose, so indexes of different
+    # tables share cached results
+    if table_name == "redis_logs":
+        table_kind = "redis_logs"
+    elif table_name.endswith('_logs'):
+        table_kind = "_logs"
+    elif table_name.endswith('_alerts'):
+        table_kind = "_alerts"
+    else:
+        table_kind = ""
+
+    return _get_index_purpose(index_name, columns, is_primary, is_unique, table_kind)
+
+@functools.lru_cache(maxsize=4096)
+def _get_index_purpose(index_name, columns, is_primary, is_unique, table_kind):
+    """Determine the purpose of an index once chunk names have been normalized
+
+    ``table_kind`` is "redis_logs", "_logs", "_alerts" or "" for other tables.
+    """
     index_name_lower = index_name.lower()
     columns_lower = columns.lower()
 
     # Handle redis_logs indexes specifically
-    if table_name == "redis_logs":
+    if table_kind == "redis_logs":
         if "time_severity" in index_name_lower:
             return "Optimizes queries filtering by time and severity level"
         elif "stream_lookup" in index_name_lower:
@@ -115,38 +223,35 @@ def get_index_purpose(index_name, columns, is_primary, is_unique, table_name):
 
     # Check primary and unique first
     if is_primary:
-        return get_string("index_purposes.special.primary_key", "Primary key lookup")
+        return get_string_fast("index_purposes.special.primary_key", "Primary key lookup")
     if is_unique:
-        return get_string("index_purposes.special.unique", "Enforce uniqueness/lookup by unique value")
+        return get_string_fast("index_purposes.special.unique", "Enforce uniqueness/lookup by unique value")
+
+    lookups = _get_lookups()
 
     # Check index name patterns
-    for pattern in ["gin", "time_idx", "pkey"]:
-        if pattern in index_name_lower:
-            purpose = get_string(f"index_purposes.name.{pattern}")
-            if purpose:
-                return purpose
+    purpose = _match_purpose(lookups['index_names'], index_name_lower)
+    if purpose:
+        return purpose
 
     # Check for multi-column patterns
     if len(columns_lower.split(',')) > 1:
-        for pattern in ["time_", "_time", "service_category", "error_"]:
-            if pattern in columns_lower or pattern in index_name_lower:
-                purpose = get_string(f"index_purposes.multi.{pattern}")
-                if purpose:
-                    return purpose
-        return get_string("index_purposes.special.multi_column", "Multi-column filtering/grouping")
+        # Patterns never contain NUL, so one scan covers both names
+        purpose = _match_purpose(lookups['index_multi'], f"{columns_lower}\0{index_name_lower}")
+        if purpose:
+            return purpose
+        return get_string_fast("index_purposes.special.multi_column", "Multi-column filtering/grouping")
 
     # Check column patterns
-    for pattern in ["time", "severity", "level", "status"]:
-        if pattern in columns_lower:
-            purpose = get_string(f"index_purposes.columns.{pattern}")
-            if purpose:
-                return purpose
+    purpose = _match_purpose(lookups['index_columns'], columns_lower)
+    if purpose:
+        return purpose
 
     # Table-specific purposes
-    if table_name.endswith('_logs') and 'severity' in columns_lower:
-        return get_string("index_purposes.special.logs_severity", "Filter logs by severity")
-    if table_name.endswith('_alerts') and ('level' in columns_lower or 'severity' in columns_lower):
-        return get_string("index_purposes.special.alerts_level", "Filter alerts by importance")
+    if table_kind in ("redis_logs", "_logs") and 'severity' in columns_lower:
+        return get_string_fast("index_purposes.special.logs_severity", "Filter logs by severity")
+    if table_kind == "_alerts" and ('level' in columns_lower or 'severity' in columns_lower):
+        return get_string_fast("index_purposes.special.alerts_level", "Filter alerts by importance")
 
     # Default
-    return get_string("index_purposes.special.default", "General filtering/lookup")
+    return get_string_fast("index_purposes.special.default", "General filtering/lookup")
@@ -2,43 +2,53 @@
 Functions for generating HTML reports.
 """
 
+import functools
 import logging
 import markdown
 import os
+import threading
 from datetime import datetime
+from pathlib import Path
 from timescaledb_report.strings import get_string, get_config
 
 logger = logging.getLogger(__name__)
 
-def markdown_to_html(md_content, title=None):
-    """Convert markdown content to HTML
+# Markdown converter reused across calls; a Markdown instance is stateful,
+# so conversions are serialized with a lock
+_md_engine = None
+_md_lock = threading.Lock()
+
+# Highlights check/cross marks in a single pass over the rendered body
+_MARK_TRANSLATION = str.maketrans({
+    '✓': '<span class="check">✓</span>',
+    '✗': '<span class="x">✗</span>'
+})
+
+def _get_md_engine():
+    """Get the shared Markdown converter, building it on first use"""
+    global _md_engine
+    if _md_engine is None:
+        _md_engine = markdown.Markdown(
+            extensions=[
+                'markdown.extensions.tables',
+                'markdown.extensions.fenced_code',
+                'markdown.extensions.toc',
+                'markdown.extensions.attr_list'
+            ]
+        )
+    return _md_engine
+
+@functools.lru_cache(maxsize=4)
+def _build_css(style_items):
+    """Build the report stylesheet from configured styles
 
     Args:
-        md_content (str): Markdown content
-        title (str, optional): HTML page title
+        style_items (tuple): Sorted (name, css) pairs from the html.style config
 
     Returns:
-        str: HTML content
+        str: CSS block, using defaults for any style not configured
     """
-    # Get title from config if not provided
-    if title is None:
-        title = get_string("html.title", "TimescaleDB Report")
-
-    # Convert markdown to HTML
-    html_body = markdown.markdown(
-        md_content,
-        extensions=[
-            'markdown.extensions.tables',
-            'markdown.extensions.fenced_code',
-            'markdown.extensions.toc',
-            'markdown.extensions.attr_list'
-        ]
-    )
-
-    # Get CSS styles from config if available
-    styles = get_config().get('html', {}).get('style', {})
-
-    # Define CSS based on configuration or use defaults
+    styles = dict(style_items)
     css = f"""
         body {{
             {styles.get('body', 'font-family: "Segoe UI", Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; max-width: 1200px; margin: 0 auto; padding: 20px;')}
@@ -86,6 +96,31 @@ def markdown_to_html(md_content, title=None):
             {styles.get('x', 'color: #e74c3c; font-weight: bold;')}
         }}
     """
+    return css
+
+def markdown_to_html(md_content, title=None):
+    """Convert markdown content to HTML
+
+    Args:
+        md_content (str): Markdown content
+        title (str, optional): HTML page title
+
+    Returns:
+        str: HTML content
+    """
+    # Get title from config if not provided
+    if title is None:
+        title = get_string("html.title", "TimescaleDB Report")
+
+    # Convert markdown to HTML
+    with _md_lock:
+        html_body = _get_md_engine().reset().convert(md_content)
+
+    # Get CSS styles from config if available
+    styles = get_config().get('html', {}).get('style', {})
+
+    # Define CSS based on configuration or use defaults
+    css = _build_css(tuple(sorted(styles.items())))
 
     # Get footer text from config
     footer_text = get_string(
@@ -106,7 +141,7 @@ def markdown_to_html(md_content, title=None):
     </style>
 </head>
 <body>
-    {html_body.replace('✓', '<span class="check">✓</span>').replace('✗', '<span class="x">✗</span>')}
+    {html_body.translate(_MARK_TRANSLATION)}
     <footer>
         <hr>
         <p><em>{footer_text}</em></p>
@@ -131,15 +166,26 @@ def generate_html_report(md_file, html_file=None):
         html_file = os.path.splitext(md_file)[0] + '.html'
 
     # Read markdown content
-    with open(md_file, 'r') as f:
-        md_content = f.read()
+    md_content = Path(md_file).read_text(encoding='utf-8')
 
+    return generate_html_report_from_string(md_content, html_file)
+
+def generate_html_report_from_string(md_content, html_file):
+    """Generate an HTML report from Markdown content already in memory
+
+    Args:
+        md_content (str): Markdown content
+        html_file (str): Path to output HTML file
+
+    Returns:
+        str: Path to output HTML file
+    """
     # Convert to HTML
     html_content = markdown_to_html(md_content)
 
-    # Write HTML file
-    with open(html_file, 'w') as f:
-        f.write(html_content)
+    # Write HTML file as one encoded buffer through a large binary write buffer
+    with open(html_file, 'wb', buffering=1 << 20) as f:
+        f.write(html_content.encode('utf-8'))
 
     # Log success message
     logger.info(get_string("log_messages.html_report_generated",
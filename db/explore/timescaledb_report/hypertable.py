@@ -2,142 +2,393 @@
 Functions for working with TimescaleDB hypertables.
 """
 
+import re
+import bisect
 import logging
-from timescaledb_report.db import check_if_extension_exists, check_if_schema_exists, safe_query
+from concurrent.futures import ThreadPoolExecutor
+from timescaledb_report.db import (
+    POOL_SIZE,
+    check_if_extension_exists,
+    check_if_schema_exists,
+    get_timescaledb_version,
+    prefetch_existence_checks,
+    prepared_query,
+    safe_query,
+)
 
 logger = logging.getLogger(__name__)
 
-def is_hypertable(db_params, table_name):
+def _build_chunk_stats_query(size_column, range_columns):
+    """Build the grouped timescaledb_information.chunks query for a set of view columns
+
+    Args:
+        size_column (str): Column with the chunk size, or None
+        range_columns (tuple): Range start and end columns, or None
+
+    Returns:
+        str: Query taking the schema name and an array of table names
+    """
+    cols = ['hypertable_name', 'COUNT(*) as chunk_count']
+    if size_column:
+        cols.append(f'SUM({size_column}) as total_size')
+    if range_columns:
+        range_start, range_end = range_columns
+        cols += [f'MIN({range_start}) as oldest_chunk', f'MAX({range_end}) as newest_chunk']
+
+    return f"""
+        SELECT {', '.join(cols)}
+        FROM timescaledb_information.chunks
+        WHERE hypertable_schema = %s AND hypertable_name = ANY(%s::text[])
+        GROUP BY hypertable_name;
+        """
+
+# Chunk stats queries keyed by the first TimescaleDB version whose chunks view
+# has the columns they use, sorted by version and built once at import. The
+# view is new in 2.0 and has no size column; sizes come from the catalog
+# fallback.
+_CHUNK_STATS_QUERY_BY_VERSION = [
+    ((0, 0), None),
+    ((2, 0), _build_chunk_stats_query(None, ('range_start', 'range_end'))),
+]
+_CHUNK_STATS_VERSIONS = [version for version, _ in _CHUNK_STATS_QUERY_BY_VERSION]
+
+# Per-table results for the current report run: {(db key, schema): {(kind, table): result}}
+_run_cache = {}
+
+# Threads for per-table catalog fallbacks; half the connection pool, so
+# other callers can still borrow connections meanwhile
+_FALLBACK_WORKERS = max(1, POOL_SIZE // 2)
+
+def _parse_version(version):
+    """Turn an extversion string like '2.11.1' or '2.0.0-rc4' into a tuple of ints"""
+    parts = []
+    for part in version.split('.'):
+        digits = re.match(r'\d+', part)
+        if not digits:
+            break
+        parts.append(int(digits.group()))
+    return tuple(parts)
+
+def _chunk_stats_query(version):
+    """Look up the chunks view query for a parsed TimescaleDB version
+
+    Returns:
+        str: Query from ``_CHUNK_STATS_QUERY_BY_VERSION``, or None when the
+            version has no usable chunks view
+    """
+    if not version:
+        return None
+    index = bisect.bisect_right(_CHUNK_STATS_VERSIONS, version) - 1
+    return _CHUNK_STATS_QUERY_BY_VERSION[index][1]
+
+def _map_tables(fn, table_names):
+    """Call fn for each table, overlapping the round-trips on a small thread pool
+
+    Args:
+        fn (callable): Function taking a table name
+        table_names (list): Table names
+
+    Returns:
+        dict: Results keyed by table name
+    """
+    if len(table_names) <= 1:
+        return {table_name: fn(table_name) for table_name in table_names}
+    with ThreadPoolExecutor(max_workers=min(_FALLBACK_WORKERS, len(table_names))) as executor:
+        return dict(zip(table_names, executor.map(fn, table_names)))
+
+def _table_cache(db_params, schema_name):
+    """Get the run cache for tables of one schema in one database"""
+    return _run_cache.setdefault((frozenset(db_params.items()), schema_name), {})
+
+def clear_hypertable_cache():
+    """Forget per-table hypertable results, e.g. at the start of a report run"""
+    _run_cache.clear()
+
+def _env(db_params):
+    """Get the TimescaleDB environment flags for a database
+
+    The extension, schema and version lookups are fetched together in one
+    round-trip and cached per database in ``db``, so later calls are served
+    from memory and each probe costs a single query.
+
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        dict: ``timescaledb`` (extension installed) and ``info_schema``
+            (timescaledb_information schema present) flags, and ``version``
+            (parsed extension version tuple or None)
+    """
+    prefetch_existence_checks(db_params, ['timescaledb'], ['timescaledb_information'])
+    timescaledb = check_if_extension_exists(db_params, 'timescaledb')
+    version = get_timescaledb_version(db_params) if timescaledb else None
+    return {
+        'timescaledb': timescaledb,
+        'info_schema': timescaledb and check_if_schema_exists(db_params, 'timescaledb_information'),
+        'version': _parse_version(version) if version else None
+    }
+
+def probe_hypertables(db_params, table_names, schema_name='public'):
+    """Collect what the hypertable helpers need to know about tables in one round-trip
+
+    Extension and schema presence come from ``_env``, and the rest is
+    fetched for all tables by a single query. Results are kept for the rest
+    of the run, so tables already probed are not queried again; failed
+    lookups are not kept. Parts that read
+    ``timescaledb_information`` are only included when that schema exists,
+    since a missing relation fails the whole statement at parse time.
+
+    Args:
+        db_params (dict): Database connection parameters
+        table_names (list): Table names to probe
+        schema_name (str): Schema the tables live in
+
+    Returns:
+        dict: Probe results keyed by table name, each with keys
+            ``timescaledb`` and ``info_schema`` (bools), ``version`` (tuple or
+            None), ``is_hypertable`` (bool) and ``hypertable`` (information
+            schema row with its time dimension, or None)
+    """
+    env = _env(db_params)
+    cache = _table_cache(db_params, schema_name)
+    table_names = list(dict.fromkeys(table_names))
+    probes = {
+        table_name: cache.get(('probe', table_name)) or {
+            'timescaledb': env['timescaledb'],
+            'info_schema': env['info_schema'],
+            'version': env['version'],
+            'is_hypertable': False,
+            'hypertable': None
+        }
+        for table_name in table_names
+    }
+    missing = [table_name for table_name in table_names if ('probe', table_name) not in cache]
+    if not env['timescaledb'] or not missing:
+        return probes
+
+    catalog_select = """
+        EXISTS (
+            SELECT 1 FROM _timescaledb_catalog.hypertable ch
+            WHERE ch.schema_name = %s AND ch.table_name = t.name
+        ) AS in_catalog
+    """
+    if env['info_schema']:
+        # Name the columns instead of taking the whole row: on newer
+        # TimescaleDB versions the view computes chunk and compression details
+        # through subselects, and PostgreSQL only skips unreferenced ones
+        query = f"""
+        SELECT
+            t.name AS table_name,
+            (SELECT jsonb_build_object('hypertable_schema', h.hypertable_schema,
+                                       'hypertable_name', h.hypertable_name,
+                                       'owner', h.owner,
+                                       'num_dimensions', h.num_dimensions,
+                                       'num_chunks', h.num_chunks,
+                                       'compression_enabled', h.compression_enabled,
+                                       'time_column', d.column_name,
+                                       'chunk_time_interval', d.time_interval::text)
+             FROM timescaledb_information.hypertables h
+             LEFT JOIN LATERAL (
+                 SELECT dim.column_name, dim.time_interval
+                 FROM timescaledb_information.dimensions dim
+                 WHERE dim.hypertable_schema = h.hypertable_schema
+                   AND dim.hypertable_name = h.hypertable_name
+                   AND dim.dimension_number = 1
+             ) d ON true
+             WHERE h.hypertable_schema = %s AND h.hypertable_name = t.name
+             LIMIT 1) AS hypertable,
+            {catalog_select}
+        FROM unnest(%s::text[]) AS t(name);
+        """
+        params = (schema_name, schema_name, missing)
+        stmt_name = 'ts_probe_info'
+    else:
+        query = f"""
+        SELECT t.name AS table_name, NULL::jsonb AS hypertable, {catalog_select}
+        FROM unnest(%s::text[]) AS t(name);
+        """
+        params = (schema_name, missing)
+        stmt_name = 'ts_probe_catalog'
+
+    rows = prepared_query(db_params, stmt_name, query, params, row_factory=tuple)
+    for table_name, hypertable, in_catalog in rows:
+        probe = probes[table_name]
+        probe['hypertable'] = hypertable
+        probe['is_hypertable'] = bool(hypertable or in_catalog)
+        cache[('probe', table_name)] = probe
+
+    return probes
+
+def probe_hypertable(db_params, table_name, schema_name='public'):
+    """Probe a single table; see ``probe_hypertables``
+
+    Args:
+        db_params (dict): Database connection parameters
+        table_name (str): Table name to probe
+        schema_name (str): Schema the table lives in
+
+    Returns:
+        dict: Probe results for the table
+    """
+    return probe_hypertables(db_params, [table_name], schema_name)[table_name]
+
+def is_hypertable(db_params, table_name, schema_name='public'):
     """Check if the given table is a TimescaleDB hypertable
 
     Args:
         db_params (dict): Database connection parameters
         table_name (str): Table name to check
+        schema_name (str): Schema the table lives in
 
     Returns:
         bool: True if table is a hypertable, False otherwise
     """
-    # First, check if TimescaleDB is installed
-    if not check_if_extension_exists(db_params, 'timescaledb'):
-        return False
+    # Once the schema's hypertables are loaded this is a set lookup
+    names = _table_cache(db_params, schema_name).get('names')
+    if names is not None:
+        return table_name in names
+    return probe_hypertable(db_params, table_name, schema_name)['is_hypertable']
+
+def get_hypertable_names(db_params, schema_name='public'):
+    """Get the names of all hypertables in a schema
+
+    Read from the catalog in one query and kept for the rest of the run;
+    ``is_hypertable`` answers from the same set afterwards.
+
+    Args:
+        db_params (dict): Database connection parameters
+        schema_name (str): Schema to list hypertables of
 
-    # Check if timescaledb_information schema exists (for newer versions)
-    if check_if_schema_exists(db_params, 'timescaledb_information'):
+    Returns:
+        frozenset: Hypertable names
+    """
+    cache = _table_cache(db_params, schema_name)
+    names = cache.get('names')
+    if names is None:
+        if not _env(db_params)['timescaledb']:
+            return frozenset()
         result = safe_query(
             db_params,
-            "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = %s;",
-            (table_name,)
+            """
+            SELECT table_name
+            FROM _timescaledb_catalog.hypertable
+            WHERE schema_name = %s;
+            """,
+            (schema_name,),
+            row_factory=tuple
         )
-        if result:
-            return True
+        names = frozenset(row[0] for row in result)
+        # An empty result may be a failed query, so only keep real answers
+        if names:
+            cache['names'] = names
+    return names
 
-    # Fallback for older TimescaleDB versions
-    result = safe_query(
-        db_params,
-        """
-        SELECT 1 FROM _timescaledb_catalog.hypertable h
-        JOIN _timescaledb_catalog.hypertable_schema s ON h.id = s.hypertable_id
-        WHERE s.schema_name = 'public' AND h.table_name = %s;
-        """,
-        (table_name,)
-    )
+def get_hypertable_info_many(db_params, table_names, schema_name='public'):
+    """Get hypertable information for several tables at once
 
-    return len(result) > 0
+    All tables are probed in one round-trip. Only hypertables the
+    information schema doesn't describe (TimescaleDB 1.x) need further
+    per-table catalog queries, which run concurrently. Results are kept for
+    the rest of the run; failed lookups are not kept.
 
-def get_hypertable_info(db_params, table_name):
+    Args:
+        db_params (dict): Database connection parameters
+        table_names (list): Table names to get hypertable info for
+        schema_name (str): Schema the tables live in
+
+    Returns:
+        dict: Hypertable information, or None if not a hypertable, keyed by
+            table name
+    """
+    cache = _table_cache(db_params, schema_name)
+    table_names = list(dict.fromkeys(table_names))
+    infos = {table_name: cache.get(('info', table_name)) for table_name in table_names}
+    missing = [table_name for table_name in table_names if ('info', table_name) not in cache]
+
+    catalog_tables = []
+    for table_name, probe in probe_hypertables(db_params, missing, schema_name).items():
+        if probe['hypertable']:
+            # Newer TimescaleDB versions (2.x+) are answered by the probe itself
+            infos[table_name] = dict(probe['hypertable'])
+        elif probe['is_hypertable']:
+            catalog_tables.append(table_name)
+
+    if catalog_tables:
+        version = _env(db_params)['version']
+        infos.update(_map_tables(
+            lambda table_name: _get_catalog_hypertable_info(db_params, table_name,
+                                                            schema_name, version),
+            catalog_tables))
+
+    # Keep only answers that actually came back: a table whose probe failed
+    # isn't in the probe cache, and a hypertable without info had its
+    # catalog lookup fail
+    for table_name in missing:
+        if ('probe', table_name) in cache and (
+                infos[table_name] is not None or table_name not in catalog_tables):
+            cache[('info', table_name)] = infos[table_name]
+    return infos
+
+def get_hypertable_info(db_params, table_name, schema_name='public'):
     """Get hypertable information for a given table
 
     Args:
         db_params (dict): Database connection parameters
         table_name (str): Table name to get hypertable info for
+        schema_name (str): Schema the table lives in
 
     Returns:
         dict: Hypertable information or None if not a hypertable
     """
-    if not is_hypertable(db_params, table_name):
-        return None
+    return get_hypertable_info_many(db_params, [table_name], schema_name)[table_name]
 
-    hypertable_info = {}
+def _get_catalog_hypertable_info(db_params, table_name, schema_name, version):
+    """Get hypertable information from the TimescaleDB catalog
 
-    # Try newer TimescaleDB version first (2.x+)
-    if check_if_schema_exists(db_params, 'timescaledb_information'):
-        result = safe_query(
-            db_params,
-            """
-            SELECT *
-            FROM timescaledb_information.hypertables
-            WHERE hypertable_name = %s;
-            """,
-            (table_name,)
-        )
-        if result:
-            return dict(result[0])
+    Used for hypertables that have no information schema row.
 
-        # Try to get time dimension info directly
-        result = safe_query(
-            db_params,
-            """
-            SELECT d.column_name, d.time_interval
-            FROM timescaledb_information.dimensions d
-            WHERE d.hypertable_name = %s
-              AND d.dimension_number = 0;
-            """,
-            (table_name,)
-        )
-        if result:
-            hypertable_info['time_column'] = result[0]['column_name']
-            hypertable_info['chunk_time_interval'] = result[0]['time_interval']
+    Args:
+        db_params (dict): Database connection parameters
+        table_name (str): Hypertable name
+        schema_name (str): Schema the hypertable lives in
+        version (tuple): Parsed TimescaleDB version or None
 
-    # If we didn't get what we need from the information schema, try the catalog
-    if 'time_column' not in hypertable_info:
-        # Get hypertable ID first
-        result = safe_query(
-            db_params,
-            """
-            SELECT h.id
-            FROM _timescaledb_catalog.hypertable h
-            WHERE h.schema_name = 'public' AND h.table_name = %s;
-            """,
-            (table_name,)
-        )
+    Returns:
+        dict: Hypertable information or None if nothing was found
+    """
+    hypertable_info = {}
 
-        if result:
-            hypertable_id = result[0]['id']
-
-            # Get time dimension info
-            result = safe_query(
-                db_params,
-                """
-                SELECT d.column_name, d.interval_length
-                FROM _timescaledb_catalog.dimension d
-                WHERE d.hypertable_id = %s AND d.column_type = 'TIME';
-                """,
-                (hypertable_id,)
-            )
-
-            if result:
-                hypertable_info['time_column'] = result[0]['column_name']
-                hypertable_info['chunk_time_interval'] = result[0]['interval_length']
-
-            # Check if compressed
-            result = safe_query(
-                db_params,
-                """
-                SELECT compressed_hypertable_id IS NOT NULL as is_compressed
-                FROM _timescaledb_catalog.hypertable
-                WHERE id = %s;
-                """,
-                (hypertable_id,)
-            )
-
-            if result:
-                hypertable_info['is_compressed'] = result[0]['is_compressed']
-
-    # If we still don't have the information, try another approach for older versions
-    if 'time_column' not in hypertable_info:
-        # For TimescaleDB 1.x versions
-        result = safe_query(
+    # Hypertable, time dimension and compression state in one round-trip
+    result = prepared_query(
+        db_params,
+        'ts_ht_catalog',
+        """
+        SELECT d.column_name, d.interval_length,
+               (h.compressed_hypertable_id IS NOT NULL) AS is_compressed
+        FROM _timescaledb_catalog.hypertable h
+        LEFT JOIN _timescaledb_catalog.dimension d
+            ON d.hypertable_id = h.id AND d.column_type = 'TIME'
+        WHERE h.schema_name = %s AND h.table_name = %s
+        LIMIT 1;
+        """,
+        (schema_name, table_name),
+        row_factory=tuple
+    )
+
+    if result:
+        column_name, interval_length, is_compressed = result[0]
+        if column_name is not None:
+            hypertable_info['time_column'] = column_name
+            hypertable_info['chunk_time_interval'] = interval_length
+        hypertable_info['is_compressed'] = is_compressed
+
+    # If we still don't have the information, try another approach for
+    # TimescaleDB before 1.7. This join goes through information_schema.columns
+    # and is expensive, so skip it when the version is unknown.
+    if 'time_column' not in hypertable_info and version and version < (1, 7):
+        result = prepared_query(
             db_params,
+            'ts_ht_time_col_v1',
             """
             SELECT c.column_name
             FROM pg_attribute a
@@ -150,148 +401,146 @@ def get_hypertable_info(db_params, table_name):
                 c.table_name = t.relname AND
                 c.column_name = a.attname
             WHERE t.relname = %s
-              AND n.nspname = 'public'
-              AND d.column_type = 'TIME';
+              AND n.nspname = %s
+              AND d.column_type = 'TIME'
+            LIMIT 1;
             """,
-            (table_name,)
+            (table_name, schema_name),
+            row_factory=tuple
         )
 
         if result:
-            hypertable_info['time_column'] = result[0]['column_name']
+            hypertable_info['time_column'] = result[0][0]
 
     # If we got information from any source, return it
     if hypertable_info:
         return hypertable_info
 
     # Last attempt - just return basic info
-    result = safe_query(
+    result = prepared_query(
         db_params,
+        'ts_ht_basic',
         """
         SELECT h.table_name, h.schema_name
         FROM _timescaledb_catalog.hypertable h
-        WHERE h.schema_name = 'public' AND h.table_name = %s
+        WHERE h.schema_name = %s AND h.table_name = %s
+        LIMIT 1;
         """,
-        (table_name,)
+        (schema_name, table_name)
     )
 
-    return dict(result[0]) if result else None
+    return result[0] if result else None
 
-def get_chunk_stats(db_params, table_name):
-    """Get statistics about chunks for a hypertable
+def get_chunk_stats_many(db_params, table_names, schema_name='public'):
+    """Get statistics about chunks for several hypertables at once
+
+    The chunks view is read for all tables in one grouped query. Only
+    tables without chunks there are probed, and only hypertables among
+    them fall back to per-table catalog queries, which run concurrently.
+    Results are kept for the rest of the run.
 
     Args:
         db_params (dict): Database connection parameters
-        table_name (str): Table name to get chunk stats for
+        table_names (list): Table names to get chunk stats for
+        schema_name (str): Schema the tables live in
 
     Returns:
-        dict: Chunk statistics including count, size, etc.
+        dict: Chunk statistics, or None if not a hypertable, keyed by table name
     """
-    if not is_hypertable(db_params, table_name):
-        return None
+    env = _env(db_params)
+    cache = _table_cache(db_params, schema_name)
+    table_names = list(dict.fromkeys(table_names))
+    stats = {table_name: cache.get(('chunks', table_name)) for table_name in table_names}
+    missing = [table_name for table_name in table_names if ('chunks', table_name) not in cache]
+    if not env['timescaledb'] or not missing:
+        return stats
 
-    # Check what columns are available in the chunks view
-    chunk_columns = []
-    if check_if_schema_exists(db_params, 'timescaledb_information'):
-        result = safe_query(
-            db_params,
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = 'timescaledb_information'
-              AND table_name = 'chunks';
-            """
-        )
-        if result:
-            chunk_columns = [row['column_name'] for row in result]
+    # Chunks view query for this TimescaleDB version
+    query = _chunk_stats_query(env['version']) if env['info_schema'] else None
 
     # For TimescaleDB 2.x+ with known column structure
-    if chunk_columns:
-        # Different versions of TimescaleDB might have different column names
-        size_column = None
-        for col in ['total_bytes', 'table_bytes', 'table_size']:
-            if col in chunk_columns:
-                size_column = col
-                break
-
-        # Build a query based on available columns
-        range_cols = []
-        if 'range_start' in chunk_columns and 'range_end' in chunk_columns:
-            range_cols = ['MIN(range_start) as oldest_chunk', 'MAX(range_end) as newest_chunk']
-        elif 'chunk_range_start' in chunk_columns and 'chunk_range_end' in chunk_columns:
-            range_cols = ['MIN(chunk_range_start) as oldest_chunk', 'MAX(chunk_range_end) as newest_chunk']
-        elif 'range_start_integer' in chunk_columns and 'range_end_integer' in chunk_columns:
-            range_cols = ['MIN(range_start_integer) as oldest_chunk', 'MAX(range_end_integer) as newest_chunk']
-
-        size_col = []
-        if size_column:
-            size_col = [f'SUM({size_column}) as total_size']
-
-        cols = ['COUNT(*) as chunk_count'] + size_col + range_cols
-
-        query = f"""
-        SELECT {', '.join(cols)}
-        FROM timescaledb_information.chunks
-        WHERE hypertable_name = %s;
-        """
+    if query:
+        # Only hypertables have chunks, so no separate check is needed for these
+        for row in prepared_query(db_params, 'ts_chunk_stats_v2', query,
+                                  (schema_name, missing)):
+            stats[row.pop('hypertable_name')] = row
+
+    remaining = [table_name for table_name in missing if stats[table_name] is None]
+    if remaining:
+        probes = probe_hypertables(db_params, remaining, schema_name)
+        catalog_tables = [table_name for table_name in remaining
+                          if probes[table_name]['is_hypertable']]
+        stats.update(_map_tables(
+            lambda table_name: _get_catalog_chunk_stats(db_params, table_name,
+                                                        schema_name, env['version']),
+            catalog_tables))
+
+    for table_name in missing:
+        cache[('chunks', table_name)] = stats[table_name]
+    return stats
+
+def get_chunk_stats(db_params, table_name, schema_name='public'):
+    """Get statistics about chunks for a hypertable
 
-        result = safe_query(db_params, query, (table_name,))
+    Args:
+        db_params (dict): Database connection parameters
+        table_name (str): Table name to get chunk stats for
+        schema_name (str): Schema the table lives in
 
-        if result and result[0]['chunk_count'] > 0:
-            return dict(result[0])
+    Returns:
+        dict: Chunk statistics including count, size, etc.
+    """
+    return get_chunk_stats_many(db_params, [table_name], schema_name)[table_name]
 
-    # For older versions or if the previous query failed - get the basic chunk count
-    result = safe_query(
-        db_params,
-        """
-        SELECT
-            COUNT(*) as chunk_count
-        FROM _timescaledb_catalog.chunk c
-        JOIN _timescaledb_catalog.hypertable h ON c.hypertable_id = h.id
-        WHERE h.schema_name = 'public' AND h.table_name = %s;
-        """,
-        (table_name,)
-    )
+def _get_catalog_chunk_stats(db_params, table_name, schema_name, version):
+    """Get chunk statistics for a hypertable from the TimescaleDB catalog
 
-    # If chunk count available, try to get size info a safer way
-    if result:
-        chunk_stats = {"chunk_count": result[0]['chunk_count']}
+    Args:
+        db_params (dict): Database connection parameters
+        table_name (str): Hypertable name
+        schema_name (str): Schema the hypertable lives in
+        version (tuple): Parsed TimescaleDB version or None
 
-        # Get hypertable ID
-        hypertable_result = safe_query(
+    Returns:
+        dict: Chunk statistics including count and size
+    """
+    # For older versions or if the previous query failed - count and size the
+    # chunks from the catalog in one round-trip
+    if version and version >= (2, 0):
+        # hypertable_size() sums all chunks server-side in one call
+        result = prepared_query(
             db_params,
+            'ts_chunk_catalog_stats',
             """
-            SELECT id
-            FROM _timescaledb_catalog.hypertable
-            WHERE schema_name = 'public' AND table_name = %s;
+            SELECT
+                (SELECT COUNT(*) FROM _timescaledb_catalog.chunk c
+                 WHERE c.hypertable_id = h.id) as chunk_count,
+                size as total_size,
+                pg_size_pretty(size) as pretty_size
+            FROM _timescaledb_catalog.hypertable h
+            CROSS JOIN LATERAL hypertable_size(format('%%I.%%I', h.schema_name, h.table_name)::regclass) AS size
+            WHERE h.schema_name = %s AND h.table_name = %s;
+            """,
+            (schema_name, table_name)
+        )
+    else:
+        # No hypertable_size() before 2.0; size each chunk by its qualified
+        # name. to_regclass skips chunks whose table is already gone
+        # instead of failing the whole query.
+        result = prepared_query(
+            db_params,
+            'ts_chunk_catalog_stats_v1',
+            """
+            SELECT
+                COUNT(*) as chunk_count,
+                SUM(pg_total_relation_size(rel)) as total_size,
+                pg_size_pretty(SUM(pg_total_relation_size(rel))) as pretty_size
+            FROM _timescaledb_catalog.chunk c
+            JOIN _timescaledb_catalog.hypertable h ON c.hypertable_id = h.id
+            CROSS JOIN LATERAL to_regclass(format('%%I.%%I', c.schema_name, c.table_name)) AS rel
+            WHERE h.schema_name = %s AND h.table_name = %s;
             """,
-            (table_name,)
+            (schema_name, table_name)
         )
 
-        if hypertable_result and len(hypertable_result) > 0:
-            try:
-                hypertable_id = hypertable_result[0]['id']
-
-                # Get aggregated size directly with planner statistics
-                size_result = safe_query(
-                    db_params,
-                    """
-                    SELECT
-                        pg_size_pretty(SUM(pg_relation_size(c.table_name::regclass))) as pretty_size,
-                        SUM(pg_relation_size(c.table_name::regclass)) as total_size
-                    FROM _timescaledb_catalog.chunk c
-                    WHERE c.hypertable_id = %s;
-                    """,
-                    (hypertable_id,)
-                )
-
-                if size_result and len(size_result) > 0:
-                    if 'total_size' in size_result[0]:
-                        chunk_stats['total_size'] = size_result[0]['total_size']
-                    if 'pretty_size' in size_result[0]:
-                        chunk_stats['pretty_size'] = size_result[0]['pretty_size']
-            except (KeyError, IndexError, Exception) as e:
-                logger.warning(f"Error getting chunk sizes for {table_name}: {e}")
-
-        return chunk_stats
-
-    return {"chunk_count": 0}
+    return result[0] if result else {"chunk_count": 0}
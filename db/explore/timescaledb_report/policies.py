@@ -2,360 +2,500 @@
 Functions for handling TimescaleDB policies (compression, retention, refresh).
 """
 
+import json
 import logging
 import re
-from timescaledb_report.db import check_if_schema_exists, safe_query
-from timescaledb_report.hypertable import is_hypertable
+from collections import deque
+from timescaledb_report.db import check_if_schema_exists, prepared_query, safe_query
+from timescaledb_report.hypertable import get_hypertable_names
 
 logger = logging.getLogger(__name__)
 
-def get_compression_info(db_params, table_name):
-    """Get compression policy information for a given table
+# Columns of timescaledb_information.continuous_aggregates per database,
+# keyed like the caches in db
+_cagg_columns_cache = {}
+
+def _continuous_aggregate_columns(db_params):
+    """Get the column names of timescaledb_information.continuous_aggregates
+
+    The view's columns differ between TimescaleDB versions but can't change
+    during a run, so they are looked up once per database. Empty results
+    (missing view or a failed query) are not cached. The lookup reads
+    pg_attribute directly rather than the much slower
+    information_schema.columns.
 
     Args:
         db_params (dict): Database connection parameters
-        table_name (str): Table name to get compression info for
 
     Returns:
-        dict: Compression information or None if not compressed
+        frozenset: Column names, empty if the view isn't available
     """
-    if not is_hypertable(db_params, table_name):
-        return None
+    key = frozenset(db_params.items())
+    column_names = _cagg_columns_cache.get(key)
+    if column_names is None:
+        columns = safe_query(
+            db_params,
+            """
+            SELECT a.attname AS column_name
+            FROM pg_attribute a
+            WHERE a.attrelid = to_regclass('timescaledb_information.continuous_aggregates')
+              AND a.attnum > 0
+              AND NOT a.attisdropped;
+            """,
+            row_factory=tuple
+        )
+        column_names = frozenset(col[0] for col in columns)
+        if column_names:
+            _cagg_columns_cache[key] = column_names
+            logger.debug("Available columns in timescaledb_information.continuous_aggregates: %s", sorted(column_names))
+    return column_names
+
+# Bulk policy lookups for the current report run, keyed by (db key, kind)
+_bulk_cache = {}
+
+def clear_policy_cache():
+    """Forget bulk policy results, e.g. at the start of a report run"""
+    _bulk_cache.clear()
+
+def _cached_bulk(db_params, kind, fetch):
+    """Run a bulk lookup once per database and run
+
+    Args:
+        db_params (dict): Database connection parameters
+        kind (str): Name of the lookup, used in the cache key
+        fetch (callable): Function taking db_params that runs the lookup
+
+    Returns:
+        The (cached) result of fetch
+    """
+    key = (frozenset(db_params.items()), kind)
+    if key not in _bulk_cache:
+        _bulk_cache[key] = fetch(db_params)
+    return _bulk_cache[key]
+
+def _index_by_table(rows, key, keep_key=True):
+    """Index query rows by table name, keeping the first row for each table
+
+    Args:
+        rows (list): Query result rows
+        key (str): Column holding the table name
+        keep_key (bool): Whether the key column stays in the row dicts
 
+    Returns:
+        dict: Row dictionaries keyed by table name
+    """
+    indexed = {}
+    for row in rows:
+        table_name = row[key] if keep_key else row.pop(key)
+        indexed.setdefault(table_name, row)
+    return indexed
+
+def _fetch_all_compression_info(db_params):
+    """Query compression information for all hypertables"""
     # Try newer TimescaleDB version first
     if check_if_schema_exists(db_params, 'timescaledb_information'):
+        # One row per column in the view; aggregate them into the same shape
+        # as the catalog fallback
         result = safe_query(
             db_params,
-            "SELECT * FROM timescaledb_information.compression_settings WHERE hypertable_name = %s;",
-            (table_name,)
+            """
+            SELECT
+                hypertable_name,
+                true as is_compressed,
+                string_agg(attname, ', ' ORDER BY segmentby_column_index)
+                    FILTER (WHERE segmentby_column_index IS NOT NULL) as compress_segmentby,
+                string_agg(attname || ' ' || CASE WHEN orderby_asc THEN 'ASC' ELSE 'DESC' END, ', '
+                           ORDER BY orderby_column_index)
+                    FILTER (WHERE orderby_column_index IS NOT NULL) as compress_orderby
+            FROM timescaledb_information.compression_settings
+            WHERE hypertable_schema = 'public'
+            GROUP BY hypertable_name;
+            """
         )
         if result:
-            return dict(result[0])
+            return _index_by_table(result, 'hypertable_name')
 
     # Fallback for older TimescaleDB versions
-    result = safe_query(
+    compressed = safe_query(
         db_params,
         """
         SELECT
+            h.table_name,
             true as is_compressed
         FROM _timescaledb_catalog.hypertable h
         WHERE h.schema_name = 'public'
-          AND h.table_name = %s
           AND h.compressed_hypertable_id IS NOT NULL;
-        """,
-        (table_name,)
+        """
+    )
+    settings = safe_query(
+        db_params,
+        """
+        SELECT
+            h.table_name,
+            string_agg(DISTINCT a.attname, ', ') FILTER (WHERE cs.segmentby_column_index IS NOT NULL) as compress_segmentby,
+            string_agg(DISTINCT a.attname || ' ' || CASE WHEN cs.orderby_asc THEN 'ASC' ELSE 'DESC' END, ', ')
+                FILTER (WHERE cs.orderby_column_index IS NOT NULL) as compress_orderby
+        FROM _timescaledb_catalog.hypertable h
+        JOIN _timescaledb_catalog.compression_settings cs ON h.id = cs.hypertable_id
+        JOIN pg_attribute a ON a.attrelid = format('%%I.%%I', 'public', h.table_name)::regclass
+            AND (a.attnum = cs.segmentby_column_index OR a.attnum = cs.orderby_column_index)
+        WHERE h.schema_name = 'public'
+        GROUP BY h.table_name;
+        """
     )
 
-    if not result:
-        result = safe_query(
-            db_params,
-            """
-            SELECT
-                h.table_name,
-                string_agg(DISTINCT a.attname, ', ') FILTER (WHERE cs.segmentby_column_index IS NOT NULL) as compress_segmentby,
-                string_agg(DISTINCT a.attname || ' ' || CASE WHEN cs.orderby_asc THEN 'ASC' ELSE 'DESC' END, ', ')
-                    FILTER (WHERE cs.orderby_column_index IS NOT NULL) as compress_orderby
-            FROM _timescaledb_catalog.hypertable h
-            JOIN _timescaledb_catalog.compression_settings cs ON h.id = cs.hypertable_id
-            JOIN pg_attribute a ON a.attrelid = format('%%I.%%I', 'public', h.table_name)::regclass
-                AND (a.attnum = cs.segmentby_column_index OR a.attnum = cs.orderby_column_index)
-            WHERE h.schema_name = 'public' AND h.table_name = %s
-            GROUP BY h.table_name;
-            """,
-            (table_name,)
-        )
+    # A compressed flag from the catalog wins over the settings row
+    info = _index_by_table(settings, 'table_name')
+    info.update(_index_by_table(compressed, 'table_name', keep_key=False))
+    return info
 
-    if not result:
-        return None
+def get_all_compression_info(db_params):
+    """Get compression policy information for all hypertables
 
-    return dict(result[0])
+    Fetched in one round-trip (two on older TimescaleDB versions) and kept
+    for the rest of the run.
 
-def get_retention_policy(db_params, table_name):
-    """Get retention policy information for a given table
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        dict: Compression information keyed by table name
+    """
+    return _cached_bulk(db_params, 'compression', _fetch_all_compression_info)
+
+def get_compression_info(db_params, table_name):
+    """Get compression policy information for a given table
 
     Args:
         db_params (dict): Database connection parameters
-        table_name (str): Table name to get retention policy for
+        table_name (str): Table name to get compression info for
 
     Returns:
-        dict: Retention policy information or None if no policy exists
+        dict: Compression information or None if not compressed
     """
-    if not is_hypertable(db_params, table_name):
-        return None
+    info = get_all_compression_info(db_params).get(table_name)
+    return dict(info) if info else None
 
+def _fetch_all_retention_policies(db_params):
+    """Query retention policies for all hypertables"""
     # Try newer TimescaleDB version first
     if check_if_schema_exists(db_params, 'timescaledb_information'):
         result = safe_query(
             db_params,
             """
-            SELECT * FROM timescaledb_information.jobs j
-            WHERE j.hypertable_name = %s AND j.proc_name = 'policy_retention';
-            """,
-            (table_name,)
+            SELECT
+                j.hypertable_name,
+                j.job_id,
+                j.schedule_interval,
+                j.config->>'drop_after' as drop_after,
+                j.config
+            FROM timescaledb_information.jobs j
+            WHERE j.proc_name = 'policy_retention'
+            AND j.hypertable_schema = 'public';
+            """
         )
         if result:
-            return dict(result[0])
+            return _index_by_table(result, 'hypertable_name')
 
     # Fallback for older TimescaleDB versions
     result = safe_query(
         db_params,
         """
         SELECT
+            h.table_name,
             j.id as job_id,
             j.schedule_interval,
+            j.config->>'drop_after' as drop_after,
             j.config
         FROM _timescaledb_config.bgw_job j
         JOIN _timescaledb_catalog.hypertable h ON j.hypertable_id = h.id
         WHERE j.proc_name = 'policy_retention'
-        AND h.schema_name = 'public' AND h.table_name = %s;
-        """,
-        (table_name,)
+        AND h.schema_name = 'public';
+        """
     )
+    return _index_by_table(result, 'table_name', keep_key=False)
 
-    if not result:
-        # Try yet another approach for older versions
-        result = safe_query(
-            db_params,
-            """
-            SELECT
-                j.id as job_id,
-                j.schedule_interval,
-                j.config
-            FROM _timescaledb_config.bgw_job j
-            WHERE j.proc_name = 'policy_retention'
-            AND j.config::text LIKE %s;
-            """,
-            (f'%"{table_name}"%',)
-        )
+def get_all_retention_policies(db_params):
+    """Get retention policies for all hypertables
 
-    return dict(result[0]) if result else None
+    Fetched in one round-trip and kept for the rest of the run.
 
-def get_continuous_aggregates(db_params, table_name):
-    """Get continuous aggregate information for a given table
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        dict: Retention policy information keyed by table name
+    """
+    return _cached_bulk(db_params, 'retention', _fetch_all_retention_policies)
+
+def get_retention_policy(db_params, table_name):
+    """Get retention policy information for a given table
 
     Args:
         db_params (dict): Database connection parameters
-        table_name (str): Table name to get continuous aggregates for
+        table_name (str): Table name to get retention policy for
 
     Returns:
-        list: List of continuous aggregate dictionaries or None if none exist
+        dict: Retention policy information or None if no policy exists
+    """
+    policy = get_all_retention_policies(db_params).get(table_name)
+    if policy:
+        return dict(policy)
+
+    # Without the jobs view, older versions may only name the table in the job
+    # config; jsonb containment avoids casting every config to text
+    if check_if_schema_exists(db_params, 'timescaledb_information') or \
+            table_name not in get_hypertable_names(db_params):
+        return None
+
+    # Runs once per table without a policy, so plan it once per connection
+    result = prepared_query(
+        db_params,
+        'ts_retention_by_config',
+        """
+        SELECT
+            j.id as job_id,
+            j.schedule_interval,
+            j.config->>'drop_after' as drop_after,
+            j.config
+        FROM _timescaledb_config.bgw_job j
+        WHERE j.proc_name = 'policy_retention'
+        AND (j.config @> %s::jsonb
+             OR j.config @> (
+                 SELECT jsonb_build_object('hypertable_id', h.id)
+                 FROM _timescaledb_catalog.hypertable h
+                 WHERE h.schema_name = 'public' AND h.table_name = %s
+             ));
+        """,
+        (json.dumps({'hypertable_name': table_name}), table_name)
+    )
+
+    return result[0] if result else None
+
+def _fetch_continuous_aggregates_by_table(db_params):
+    """Query the direct continuous aggregates of all tables
+
+    Every row is a direct relationship, so the type is set here rather than
+    sent by the server with each row.
     """
+    aggregates = {}
+
     # Try newer TimescaleDB version first
     if check_if_schema_exists(db_params, 'timescaledb_information'):
         # Check what columns are available
-        columns = safe_query(
-            db_params,
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = 'timescaledb_information'
-              AND table_name = 'continuous_aggregates';
+        column_names = _continuous_aggregate_columns(db_params)
+
+        # Build a query using the available columns
+        if 'hypertable_name' in column_names:
+            # For TimescaleDB 2.x
+            view_schema = 'view_schema' if 'view_schema' in column_names else ('user_view_schema' if 'user_view_schema' in column_names else "'public'")
+            view_name = 'view_name' if 'view_name' in column_names else 'user_view_name'
+
+            query = f"""
+            SELECT
+                hypertable_name,
+                {view_schema} || '.' || {view_name} as view_name,
+                {view_name} as view_short_name
+            FROM timescaledb_information.continuous_aggregates;
             """
-        )
 
-        if columns:
-            # Build a query using the available columns
-            column_names = [col['column_name'] for col in columns]
-            logger.debug(f"Available columns in timescaledb_information.continuous_aggregates: {column_names}")
-
-            # Check if we have the expected columns
-            if 'hypertable_name' in column_names:
-                # For TimescaleDB 2.x
-                view_schema = 'view_schema' if 'view_schema' in column_names else ('user_view_schema' if 'user_view_schema' in column_names else "'public'")
-                view_name = 'view_name' if 'view_name' in column_names else 'user_view_name'
-
-                query = f"""
-                SELECT
-                    {view_schema} || '.' || {view_name} as view_name,
-                    {view_name} as view_short_name,
-                    'direct' as relationship_type
-                FROM timescaledb_information.continuous_aggregates
-                WHERE hypertable_name = %s;
-                """
-
-                result = safe_query(db_params, query, (table_name,))
-                if result:
-                    return [dict(r) for r in result]
+            for row in safe_query(db_params, query):
+                row['relationship_type'] = 'direct'
+                aggregates.setdefault(row.pop('hypertable_name'), []).append(row)
+            if aggregates:
+                return aggregates
 
     # Fallback for older TimescaleDB versions
     result = safe_query(
         db_params,
         """
         SELECT
+            h.table_name,
             h.schema_name || '.' || h.table_name as hypertable_name,
             cagg.user_view_schema || '.' || cagg.user_view_name as view_name,
             cagg.user_view_name as view_short_name,
-            'direct' as relationship_type,
             cagg.materialized_only
         FROM _timescaledb_catalog.hypertable h
         JOIN _timescaledb_catalog.continuous_agg cagg ON h.id = cagg.raw_hypertable_id
-        WHERE h.schema_name = 'public' AND h.table_name = %s;
-        """,
-        (table_name,)
+        WHERE h.schema_name = 'public';
+        """
     )
+    for row in result:
+        row['relationship_type'] = 'direct'
+        aggregates.setdefault(row.pop('table_name'), []).append(row)
+    return aggregates
 
-    return [dict(r) for r in result] if result else None
+def get_continuous_aggregates_by_table(db_params):
+    """Get the direct continuous aggregates of all tables
 
-def get_all_continuous_aggregates(db_params):
-    """Get all continuous aggregates with their source tables, including multi-level relationships
+    Fetched in one round-trip and kept for the rest of the run.
 
     Args:
         db_params (dict): Database connection parameters
 
     Returns:
-        dict: Information about continuous aggregates including chained relationships
+        dict: Lists of continuous aggregate dictionaries keyed by source table name
+    """
+    return _cached_bulk(db_params, 'continuous_aggregates', _fetch_continuous_aggregates_by_table)
+
+def get_continuous_aggregates(db_params, table_name):
+    """Get continuous aggregate information for a given table
+
+    Args:
+        db_params (dict): Database connection parameters
+        table_name (str): Table name to get continuous aggregates for
+
+    Returns:
+        list: List of continuous aggregate dictionaries or None if none exist
+    """
+    aggregates = get_continuous_aggregates_by_table(db_params).get(table_name)
+    return list(aggregates) if aggregates else None
+
+def _view_name_pattern(view_names):
+    """Compile a regex matching any of the given view names as a whole identifier
+
+    Matching is case-sensitive on purpose. Definitions come from
+    pg_get_viewdef, which prints each name exactly as stored and quotes
+    mixed-case ones, so folding case would only link ``foo`` to ``"Foo"``.
+
+    Args:
+        view_names (iterable): View names to look for
+
+    Returns:
+        re.Pattern: Compiled pattern, or None if there are no names
     """
+    # Longest first, so the alternation prefers the longest name at a position
+    names = sorted(view_names, key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile(r'(?<![\w$])(' + '|'.join(map(re.escape, names)) + r')(?![\w$])')
+
+def _fetch_all_continuous_aggregates(db_params):
+    """Query all continuous aggregates and work out their relationships"""
     result = []
     agg_chain = {}
     materialized_tables = {}
     mat_to_view_mapping = {}  # Mapping from materialized tables to user views
     view_definitions = {}
 
-    # STEP 1: Get the view definitions from timescaledb_information.continuous_aggregates
-    # This gives us the true SQL definitions that show the dependencies
+    # STEPS 1-3: One catalog query returns every continuous aggregate with its
+    # raw and materialized hypertables and its view definition. The definition
+    # comes from timescaledb_information when it has one (2.x); the server
+    # deparses only the remaining views, so no second round-trip is needed.
+    view_definition = "pg_get_viewdef(view_rel)"
+    info_join = ""
     if check_if_schema_exists(db_params, 'timescaledb_information'):
-        view_def_query = """
-        SELECT
-            view_name,
-            view_definition
-        FROM timescaledb_information.continuous_aggregates
-        """
-        view_defs = safe_query(db_params, view_def_query)
-        if view_defs:
-            logger.debug(f"Found {len(view_defs)} continuous aggregate view definitions")
-            for row in view_defs:
-                if 'view_name' in row and 'view_definition' in row:
-                    view_name = row['view_name']
-                    view_def = row['view_definition']
-                    view_definitions[view_name] = view_def
-                    logger.debug(f"Stored view definition for {view_name} (length: {len(view_def)})")
-
-    # Also get view definitions from pg_get_viewdef for views not in TimescaleDB's continuous aggregates
-    view_query = """
-    SELECT
-        c.relname AS view_name,
-        pg_get_viewdef(c.oid) AS definition
-    FROM pg_class c
-    JOIN pg_namespace n ON n.oid = c.relnamespace
-    WHERE c.relkind = 'v'
-      AND n.nspname = 'public'
-    """
-
-    views = safe_query(db_params, view_query)
-    if views:
-        logger.debug(f"Found {len(views)} views using pg_get_viewdef")
-        for view in views:
-            if 'view_name' in view and 'definition' in view:
-                view_name = view['view_name']
-                if view_name not in view_definitions:  # Don't overwrite existing definitions
-                    view_definitions[view_name] = view['definition']
-                    logger.debug(f"Added view definition for '{view_name}' from pg_get_viewdef")
-
-    # STEP 2: Get the mapping between materialized hypertables and user views
-    mat_view_query = """
+        column_names = _continuous_aggregate_columns(db_params)
+        if 'view_definition' in column_names and 'view_schema' in column_names:
+            view_definition = "COALESCE(info.view_definition, pg_get_viewdef(view_rel))"
+            info_join = """
+    LEFT JOIN timescaledb_information.continuous_aggregates info
+        ON info.view_schema = cagg.user_view_schema
+       AND info.view_name = cagg.user_view_name"""
+
+    cagg_query = f"""
     SELECT
-        h.schema_name || '.' || h.table_name as mat_hypertable,
-        h.table_name as mat_hypertable_short,
-        cagg.user_view_schema || '.' || cagg.user_view_name as view_name,
-        cagg.user_view_name as view_name_short
-    FROM _timescaledb_catalog.hypertable h
-    JOIN _timescaledb_catalog.continuous_agg cagg ON h.id = cagg.mat_hypertable_id
-    WHERE h.schema_name = '_timescaledb_internal'
+        h_raw.schema_name || '.' || h_raw.table_name as raw_table,
+        h_raw.table_name as raw_table_name,
+        cagg.raw_hypertable_id as raw_id,
+        cagg.mat_hypertable_id as mat_id,
+        h_mat.schema_name || '.' || h_mat.table_name as mat_hypertable,
+        h_mat.table_name as mat_hypertable_short,
+        cagg.user_view_schema || '.' || cagg.user_view_name as agg_view,
+        cagg.user_view_name as agg_view_name,
+        {view_definition} as view_definition
+    FROM _timescaledb_catalog.continuous_agg cagg
+    JOIN _timescaledb_catalog.hypertable h_raw ON h_raw.id = cagg.raw_hypertable_id
+    JOIN _timescaledb_catalog.hypertable h_mat ON h_mat.id = cagg.mat_hypertable_id
+    CROSS JOIN LATERAL to_regclass(format('%%I.%%I', cagg.user_view_schema, cagg.user_view_name)) AS view_rel{info_join}
+    ORDER BY cagg.mat_hypertable_id
     """
-
-    mat_views = safe_query(db_params, mat_view_query)
-    if mat_views:
-        logger.debug(f"Found {len(mat_views)} materialized hypertable to view mappings")
-        for row in mat_views:
-            if 'mat_hypertable' in row and 'view_name' in row:
-                mat_table = row['mat_hypertable']
-                mat_short = row['mat_hypertable_short']
-                view_name = row['view_name']
-                view_short = row['view_name_short']
-
-                # Store in materialized_tables
-                materialized_tables[mat_table] = {
-                    'view_name': view_name,
-                    'view_name_short': view_short
-                }
-
-                # Create reverse mapping from materialized table to view
-                mat_to_view_mapping[mat_short] = view_short
-                logger.debug(f"Materialized mapping: {mat_short} -> {view_short}")
-
-    # STEP 3: Get direct aggregate relationships
-    # Try newer TimescaleDB version first
-    if check_if_schema_exists(db_params, 'timescaledb_information'):
-        # Check what columns are available
-        columns = safe_query(
-            db_params,
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = 'timescaledb_information'
-              AND table_name = 'continuous_aggregates';
-            """
-        )
-
-        if columns:
-            column_names = [col['column_name'] for col in columns]
-            logger.debug(f"Available columns in timescaledb_information.continuous_aggregates: {column_names}")
-
-            if 'hypertable_name' in column_names:
-                # For TimescaleDB 2.x
-                hypertable_schema = 'hypertable_schema' if 'hypertable_schema' in column_names else "'public'"
-                hypertable_name = 'hypertable_name'
-                view_schema = 'view_schema' if 'view_schema' in column_names else ('user_view_schema' if 'user_view_schema' in column_names else "'public'")
-                view_name = 'view_name' if 'view_name' in column_names else 'user_view_name'
-
-                query = f"""
-                SELECT
-                    {hypertable_schema} || '.' || {hypertable_name} as raw_table,
-                    {hypertable_name} as raw_table_name,
-                    {view_schema} || '.' || {view_name} as agg_view,
-                    {view_name} as agg_view_name,
-                    'direct' as relationship_type
-                FROM timescaledb_information.continuous_aggregates
-                """
-
-                direct_aggs = safe_query(db_params, query)
-                if direct_aggs:
-                    logger.debug(f"Found {len(direct_aggs)} direct continuous aggregates")
-                    for row in direct_aggs:
-                        relationship = dict(row)
-                        result.append(relationship)
-
-                        # Add to agg_chain
-                        table_name = relationship['raw_table_name']
-                        agg_name = relationship['agg_view_name']
-
-                        if table_name not in agg_chain:
-                            agg_chain[table_name] = {'direct': [], 'indirect': []}
-
-                        agg_chain[table_name]['direct'].append(agg_name)
-                        logger.debug(f"Added direct relationship: {table_name} -> {agg_name}")
+    caggs = safe_query(db_params, cagg_query)
+    if caggs:
+        logger.debug("Found %d continuous aggregates from catalog", len(caggs))
+
+    for cagg in caggs:
+        table_name = cagg['raw_table_name']
+        view_short = cagg['agg_view_name']
+
+        # View definitions show the dependencies between aggregates
+        if cagg['view_definition'] is not None:
+            view_definitions[view_short] = cagg['view_definition']
+            logger.debug("Stored view definition for %s (length: %d)", view_short, len(cagg['view_definition']))
+
+        # Mapping between materialized hypertables and user views
+        materialized_tables[cagg['mat_hypertable']] = {
+            'view_name': cagg['agg_view'],
+            'view_name_short': view_short
+        }
+        mat_to_view_mapping[cagg['mat_hypertable_short']] = view_short
+        logger.debug("Materialized mapping: %s -> %s", cagg['mat_hypertable_short'], view_short)
+
+        # Direct aggregate relationships
+        result.append({
+            'raw_table': cagg['raw_table'],
+            'raw_table_name': table_name,
+            'agg_view': cagg['agg_view'],
+            'agg_view_name': view_short,
+            'relationship_type': 'direct'
+        })
+        if table_name not in agg_chain:
+            agg_chain[table_name] = {'direct': [], 'indirect': []}
+        agg_chain[table_name]['direct'].append(view_short)
+        logger.debug("Added direct relationship: %s -> %s", table_name, view_short)
 
     # STEP 4: Analyze view definitions to find chained relationships
     chained_aggs = []
-
-    # Process all view definitions to find dependencies
-    for view_name, definition in view_definitions.items():
-        for other_view_name in view_definitions.keys():
-            if view_name != other_view_name and other_view_name in definition:
-                # Found a dependency in the view definition
-                logger.debug(f"Found dependency in view definition: {view_name} depends on {other_view_name}")
-
-                chained_aggs.append({
-                    'raw_table_name': other_view_name,
-                    'agg_view_name': view_name,
-                    'relationship_type': 'chained'
-                })
+    chained_pairs = set()
+
+    # Scan every definition once for the view names that appear in it. One
+    # alternation of all view names does the scan; the identifier boundaries
+    # keep a name from matching inside a longer one (v1 in v1_hourly).
+    view_names = tuple(view_definitions)
+    view_order = {name: i for i, name in enumerate(view_names)}
+    view_name_re = _view_name_pattern(view_names)
+    appeared = {}
+    if view_name_re:
+        for view_name, definition in view_definitions.items():
+            names = set(view_name_re.findall(definition))
+            names.discard(view_name)
+            if names:
+                appeared[view_name] = names
+
+    # Turn the appearances into edges, in view order for a stable report
+    for view_name, names in appeared.items():
+        for other_view_name in sorted(names, key=view_order.__getitem__):
+            # Found a dependency in the view definition
+            logger.debug("Found dependency in view definition: %s depends on %s", view_name, other_view_name)
+
+            chained_pairs.add((other_view_name, view_name))
+            chained_aggs.append({
+                'raw_table_name': other_view_name,
+                'agg_view_name': view_name,
+                'relationship_type': 'chained'
+            })
+
+    # Aggregates built on another aggregate name its materialized hypertable
+    # as their raw hypertable, which catches chains the view text doesn't show
+    mat_id_to_view = {cagg['mat_id']: cagg['agg_view_name'] for cagg in caggs}
+    for cagg in caggs:
+        parent_view = mat_id_to_view.get(cagg['raw_id'])
+        if parent_view is None or (parent_view, cagg['agg_view_name']) in chained_pairs:
+            continue
+        chained_pairs.add((parent_view, cagg['agg_view_name']))
+        logger.debug("Found dependency in catalog: %s depends on %s", cagg['agg_view_name'], parent_view)
+        chained_aggs.append({
+            'raw_table_name': parent_view,
+            'agg_view_name': cagg['agg_view_name'],
+            'relationship_type': 'chained'
+        })
 
     # STEP 5: Process chained relationships to build the complete chain
+    chain_edges = {}
     for chain in chained_aggs:
         source = chain['raw_table_name']
         target = chain['agg_view_name']
-        logger.debug(f"Processing chained relationship: {source} -> {target}")
+        logger.debug("Processing chained relationship: %s -> %s", source, target)
 
         # Add this chained relationship to the result
         result.append({
@@ -366,112 +506,37 @@ def get_all_continuous_aggregates(db_params):
             'relationship_type': 'chained'
         })
 
-        # Find all tables that have source as a direct aggregate
-        for base_table, aggs in agg_chain.items():
-            if source in aggs['direct']:
-                # This is an indirect relationship to the original base table
-                if 'indirect' not in agg_chain[base_table]:
-                    agg_chain[base_table]['indirect'] = []
-                if target not in agg_chain[base_table]['indirect']:
-                    agg_chain[base_table]['indirect'].append(target)
-                    logger.debug(f"Added indirect relationship: {base_table} -> {source} -> {target}")
-
-    # Special handling for multi-level chains - we need to do this in multiple passes
-    # to catch deeply nested chains
-    for _ in range(3):  # Do up to 3 passes to catch chains up to level 4
-        chains_found = 0
-        for chain in chained_aggs:
-            source = chain['raw_table_name']
-            target = chain['agg_view_name']
-
-            # Look for any table that has 'source' as an indirect aggregate
-            for base_table, aggs in agg_chain.items():
-                if source in aggs.get('indirect', []):
-                    # If source is an indirect aggregate, then target is also an indirect aggregate
-                    if 'indirect' not in agg_chain[base_table]:
-                        agg_chain[base_table]['indirect'] = []
-                    if target not in agg_chain[base_table]['indirect']:
-                        agg_chain[base_table]['indirect'].append(target)
-                        logger.debug(f"Added deep chain: {base_table} -> [..] -> {source} -> {target}")
-                        chains_found += 1
-
-        if chains_found == 0:
-            break
-
-    # STEP 6: Build a dependency graph for path-finding
+        targets = chain_edges.setdefault(source, [])
+        if target not in targets:
+            targets.append(target)
+
+    # Every view reachable from a table's direct aggregates through chained
+    # relationships is an indirect aggregate of that table, however deep the
+    # chain goes
+    for base_table, aggs in agg_chain.items():
+        indirect = aggs.setdefault('indirect', [])
+        seen = set(aggs['direct'])
+        queue = deque(aggs['direct'])
+        while queue:
+            source = queue.popleft()
+            for target in chain_edges.get(source, ()):
+                if target in seen:
+                    continue
+                seen.add(target)
+                queue.append(target)
+                if target not in indirect:
+                    indirect.append(target)
+                    logger.debug("Added indirect relationship: %s -> [..] -> %s -> %s", base_table, source, target)
+
+    # STEP 6: Build a dependency graph for path-finding. Direct rows come one
+    # per aggregate from the catalog and chained pairs are deduplicated above,
+    # so every relationship is already a distinct edge.
     graph = {}
     for row in result:
-        if 'raw_table_name' in row and 'agg_view_name' in row:
-            source = row['raw_table_name']
-            target = row['agg_view_name']
-
-            if source not in graph:
-                graph[source] = []
-            if target not in graph[source]:
-                graph[source].append(target)
-                logger.debug(f"Added to dependency graph: {source} -> {target}")
-
-    # STEP 7: Fix TimescaleDB continuous aggregate chains by direct table introspection
-    # This handles the case where views reference internal materialized tables
-    # Fixed query to use h.id instead of v.id to avoid the "column v.id does not exist" error
-    cagg_query = """
-    SELECT
-        h.schema_name || '.' || h.table_name as raw_table,
-        h.table_name as raw_table_name,
-        v.raw_hypertable_id as raw_id,
-        h.id as cagg_id,
-        v.user_view_name as view_name
-    FROM _timescaledb_catalog.continuous_agg v
-    JOIN _timescaledb_catalog.hypertable h ON h.id = v.raw_hypertable_id
-    WHERE h.schema_name = 'public'
-    ORDER BY h.id
-    """
-    caggs = safe_query(db_params, cagg_query)
-
-    if caggs:
-        logger.debug(f"Found {len(caggs)} continuous aggregates from catalog")
-
-        # List them for debugging
-        for cagg in caggs:
-            logger.debug(f"Catalog cagg: {cagg}")
-
-        # Find multi-level chains by correlating IDs
-        # First, build a mapping from raw_id to all views that use it
-        raw_to_views = {}
-        for cagg in caggs:
-            raw_id = cagg['raw_id']
-            view_name = cagg['view_name']
-
-            if raw_id not in raw_to_views:
-                raw_to_views[raw_id] = []
-            raw_to_views[raw_id].append(view_name)
-
-        # Check specifically for health metrics chain
-        health_views = []
-        for cagg in caggs:
-            if cagg['view_name'].startswith('health_metrics_'):
-                health_views.append(cagg['view_name'])
-
-        # Sort them by level (1min, 1hour, 1day)
-        health_views.sort()
-        logger.debug(f"Found health metrics views: {health_views}")
-
-        if len(health_views) >= 2:
-            # Assume they form a chain from raw → 1min → 1hour → 1day
-            if 'health_metrics_raw' in agg_chain:
-                for i in range(1, len(health_views)):
-                    previous = health_views[i-1]
-                    current = health_views[i]
-
-                    # Check if this view is already in the chain
-                    if current not in agg_chain['health_metrics_raw'].get('direct', []) and \
-                       current not in agg_chain['health_metrics_raw'].get('indirect', []):
-                        # Add it as an indirect dependency
-                        if 'indirect' not in agg_chain['health_metrics_raw']:
-                            agg_chain['health_metrics_raw']['indirect'] = []
-
-                        agg_chain['health_metrics_raw']['indirect'].append(current)
-                        logger.debug(f"Added missing health metrics chain link: health_metrics_raw -> {current}")
+        source = row['raw_table_name']
+        target = row['agg_view_name']
+        graph.setdefault(source, []).append(target)
+        logger.debug("Added to dependency graph: %s -> %s", source, target)
 
     return {
         'agg_relationships': result,
@@ -481,6 +546,20 @@ def get_all_continuous_aggregates(db_params):
         'dependency_graph': graph
     }
 
+def get_all_continuous_aggregates(db_params):
+    """Get all continuous aggregates with their source tables, including multi-level relationships
+
+    Built once per run; later calls, e.g. one per table in the report,
+    reuse the result.
+
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        dict: Information about continuous aggregates including chained relationships
+    """
+    return _cached_bulk(db_params, 'all_continuous_aggregates', _fetch_all_continuous_aggregates)
+
 def get_refresh_policies(db_params):
     """Get refresh policies for continuous aggregates
 
@@ -494,10 +573,17 @@ def get_refresh_policies(db_params):
     if check_if_schema_exists(db_params, 'timescaledb_information'):
         result = safe_query(
             db_params,
-            "SELECT * FROM timescaledb_information.continuous_aggregate_policies;"
+            """
+            SELECT
+                j.job_id,
+                j.schedule_interval,
+                j.config
+            FROM timescaledb_information.jobs j
+            WHERE j.proc_name = 'policy_refresh_continuous_aggregate';
+            """
         )
         if result:
-            return [dict(r) for r in result]
+            return result
 
     # Fallback for older TimescaleDB versions - simplified
     result = safe_query(
@@ -512,4 +598,4 @@ def get_refresh_policies(db_params):
         """
     )
 
-    return [dict(r) for r in result] if result else None
+    return result or None
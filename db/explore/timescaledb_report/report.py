@@ -3,21 +3,36 @@ Functions for generating Markdown reports focused on database schema and context
 """
 
 import logging
+import re
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from tabulate import tabulate
 
 from timescaledb_report.strings import get_string
-from timescaledb_report.db import get_timescaledb_version
-from timescaledb_report.schema import get_all_tables, get_table_schema, get_indexes
-from timescaledb_report.hypertable import is_hypertable, get_hypertable_info
-from timescaledb_report.policies import get_continuous_aggregates, get_all_continuous_aggregates
+from timescaledb_report.db import (
+    POOL_SIZE,
+    clear_existence_cache,
+    get_timescaledb_version,
+    get_database_size_info,
+    prefetch_existence_checks
+)
+from timescaledb_report.schema import get_all_tables, get_all_table_schemas, get_all_indexes
+from timescaledb_report.hypertable import get_hypertable_info_many, clear_hypertable_cache
+from timescaledb_report.policies import (
+    get_continuous_aggregates,
+    get_all_continuous_aggregates,
+    clear_policy_cache,
+)
 from timescaledb_report.descriptions import (
+    clear_purpose_caches,
     get_table_purpose,
     get_column_purpose,
     get_index_purpose
 )
 from timescaledb_report.stats import (
-    get_database_health_score,
+    score_database_health,
+    average_exec_time,
     get_connection_statistics,
     get_slow_queries,
     get_unused_indexes,
@@ -32,14 +47,53 @@ from timescaledb_report.stats import (
 
 logger = logging.getLogger(__name__)
 
+# Relation lists a view definition reads from (FROM x / JOIN schema.x, and
+# comma-separated lists like "FROM a a_1,\n b"), for finding the views it
+# references; case-insensitive so no lowercased copy is needed. The list is
+# captured in a lookahead so a JOIN taken for an alias is still matched.
+_RELATION_LIST_RE = re.compile(
+    r'\b(?:FROM|JOIN)\s+(?=((?:"?\w+"?\.)?"?\w+"?(?:\s+(?:AS\s+)?"?\w+"?)?'
+    r'(?:\s*,\s*(?:"?\w+"?\.)?"?\w+"?(?:\s+(?:AS\s+)?"?\w+"?)?)*))',
+    re.IGNORECASE)
+
+# Relation name at the start of one list item, without schema or alias
+_RELATION_NAME_RE = re.compile(r'\s*(?:"?\w+"?\.)?"?(\w+)')
+
+def _view_relations(definition):
+    """Get the names of the relations a view definition reads from
+
+    Args:
+        definition (str): View definition as returned by pg_get_viewdef
+
+    Returns:
+        set: Relation names without schema
+    """
+    return {_RELATION_NAME_RE.match(item).group(1)
+            for relation_list in _RELATION_LIST_RE.findall(definition)
+            for item in relation_list.split(',')}
+
+# Above this many rows tables are emitted unpadded; tabulate's column-width
+# pass costs more than the alignment is worth in raw Markdown
+_FAST_TABLE_ROWS = 500
+
+def _fast_md_table(headers, rows):
+    """Create an unpadded pipe-format markdown table in a single pass"""
+    lines = ["| " + " | ".join(map(str, headers)) + " |",
+             "|" + "---|" * len(headers)]
+    lines.extend("| " + " | ".join("" if cell is None else str(cell) for cell in row) + " |"
+                 for row in rows)
+    return "\n".join(lines)
+
 def format_markdown_table(headers, rows):
     """Use tabulate to create a well-formatted markdown table"""
+    if len(rows) > _FAST_TABLE_ROWS:
+        return _fast_md_table(headers, rows)
     return tabulate(rows, headers=headers, tablefmt="pipe")
 
-def generate_toc(tables):
+def generate_toc(tables, already_sorted=False):
     """Generate a table of contents for the tables"""
     toc = [f"## {get_string('report.sections.table_of_contents', 'Table of Contents')}\n"]
-    for table in sorted(tables):
+    for table in (tables if already_sorted else sorted(tables)):
         # Use underscores in anchors to match how HTML ids are generated
         anchor = table.lower()
         toc.append(f"- [{table}](#{anchor})")
@@ -57,10 +111,20 @@ def build_aggregate_chains(agg_chain, view_definitions, dependency_graph=None):
         dict: Dictionary mapping each base table to its complete aggregate chain
     """
     logger.debug("Starting to build aggregate chains")
-    logger.debug(f"Input agg_chain has {len(agg_chain)} base tables")
-    logger.debug(f"Input view_definitions has {len(view_definitions)} views")
+    logger.debug("Input agg_chain has %s base tables", len(agg_chain))
+    logger.debug("Input view_definitions has %s views", len(view_definitions))
     if dependency_graph:
-        logger.debug(f"Input dependency_graph has {len(dependency_graph)} nodes")
+        logger.debug("Input dependency_graph has %s nodes", len(dependency_graph))
+
+    # Which chain views each view definition reads from. Every definition is
+    # scanned once here instead of being substring-searched for every pair
+    # of views below.
+    known_views = set()
+    for aggregates in agg_chain.values():
+        known_views.update(aggregates.get('direct', []))
+        known_views.update(aggregates.get('indirect', []))
+    refs = {view: _view_relations(view_definitions[view]) & known_views
+            for view in known_views if view_definitions.get(view)}
 
     # Start with a copy of the agg_chain
     complete_chains = {}
@@ -70,178 +134,210 @@ def build_aggregate_chains(agg_chain, view_definitions, dependency_graph=None):
         direct_aggs = aggregates.get('direct', [])
         indirect_aggs = aggregates.get('indirect', [])
 
-        logger.debug(f"Processing table: {table}")
-        logger.debug(f"  Direct aggregates: {direct_aggs}")
-        logger.debug(f"  Indirect aggregates: {indirect_aggs}")
+        logger.debug("Processing table: %s", table)
+        logger.debug("  Direct aggregates: %s", direct_aggs)
+        logger.debug("  Indirect aggregates: %s", indirect_aggs)
 
         if direct_aggs:
             # Initialize the chain for this table
-            if table not in complete_chains:
-                complete_chains[table] = {}
+            chain = complete_chains.setdefault(table, {})
 
             # Add direct aggregates as first level
             for agg in direct_aggs:
-                complete_chains[table][agg] = {'level': 1, 'source': table, 'children': []}
-                logger.debug(f"  Added direct level 1: {table} -> {agg}")
+                chain[agg] = {'level': 1, 'source': table, 'children': set()}
+                logger.debug("  Added direct level 1: %s -> %s", table, agg)
 
             # Process indirect aggregates
             for indirect in indirect_aggs:
-                logger.debug(f"  Processing indirect aggregate: {indirect}")
+                logger.debug("  Processing indirect aggregate: %s", indirect)
                 # Find which direct aggregate this is based on by checking view definitions
+                indirect_refs = refs.get(indirect, ())
                 for direct in direct_aggs:
-                    if indirect in view_definitions and direct in view_definitions[indirect]:
+                    if direct in indirect_refs:
                         level = 2  # Default to level 2
                         source = direct
-                        logger.debug(f"    Found in view definition: {indirect} depends on {direct}")
+                        logger.debug("    Found in view definition: %s depends on %s", indirect, direct)
 
                         # Add to the chain
-                        if direct in complete_chains[table]:
-                            complete_chains[table][direct]['children'].append(indirect)
-                            logger.debug(f"    Added as child: {direct} -> {indirect}")
+                        if direct in chain:
+                            chain[direct]['children'].add(indirect)
+                            logger.debug("    Added as child: %s -> %s", direct, indirect)
 
                             # Also add as a separate entry
-                            complete_chains[table][indirect] = {
+                            chain[indirect] = {
                                 'level': level,
                                 'source': source,
-                                'children': []
+                                'children': set()
                             }
-                            logger.debug(f"    Set {indirect} at level {level}, source={source}")
+                            logger.debug("    Set %s at level %s, source=%s", indirect, level, source)
 
                 # Check for level 3+ relationships (recursive)
                 for level2_agg in indirect_aggs:
-                    if indirect != level2_agg and indirect in view_definitions and level2_agg in view_definitions[indirect]:
+                    if indirect != level2_agg and level2_agg in indirect_refs:
                         # This is a level 3+ relationship
                         level = 3
                         source = level2_agg
-                        logger.debug(f"    Found level 3+ relationship: {indirect} depends on {level2_agg}")
+                        logger.debug("    Found level 3+ relationship: %s depends on %s", indirect, level2_agg)
 
                         # Update the chain
-                        if level2_agg in complete_chains[table]:
-                            complete_chains[table][level2_agg]['children'].append(indirect)
-                            logger.debug(f"    Added as level 3 child: {level2_agg} -> {indirect}")
+                        if level2_agg in chain:
+                            chain[level2_agg]['children'].add(indirect)
+                            logger.debug("    Added as level 3 child: %s -> %s", level2_agg, indirect)
 
                             # Add/update the entry
-                            complete_chains[table][indirect] = {
+                            chain[indirect] = {
                                 'level': level,
                                 'source': source,
-                                'children': []
+                                'children': set()
                             }
-                            logger.debug(f"    Set {indirect} at level {level}, source={source}")
+                            logger.debug("    Set %s at level %s, source=%s", indirect, level, source)
 
     # If there are missing connections in the chain, try to complete them using the view definitions
     # This is the improved part to better handle chained aggregates
     logger.debug("Looking for missing connections in chains using view definitions")
-    for table in complete_chains:
+    for table, chain in complete_chains.items():
         # Get all views in this chain
-        views = list(complete_chains[table].keys())
-        logger.debug(f"Table {table} chain has views: {views}")
+        views = list(chain)
+        logger.debug("Table %s chain has views: %s", table, views)
 
         # Iterate through views to find potential dependencies
         for view in views:
             view_def = view_definitions.get(view, "")
             if view_def:
-                logger.debug(f"Checking view definition for {view} (length: {len(view_def)})")
+                logger.debug("Checking view definition for %s (length: %s)", view, len(view_def))
             else:
-                logger.debug(f"No view definition found for {view}")
+                logger.debug("No view definition found for %s", view)
 
-            # Look for "FROM view_name" patterns
+            # Look for other chain views referenced by the definition
+            view_refs = refs.get(view)
+            if not view_refs:
+                continue
             for other_view in views:
-                if view != other_view and other_view in view_def:
+                if view != other_view and other_view in view_refs:
                     # Found a dependency: other_view is used by view
                     # Update level and source
-                    other_view_level = complete_chains[table][other_view]['level']
+                    other_view_level = chain[other_view]['level']
                     new_level = other_view_level + 1
-                    logger.debug(f"Found dependency in view definition: {view} uses {other_view}")
-                    logger.debug(f"  {other_view} is at level {other_view_level}, so {view} should be at level {new_level}")
+                    logger.debug("Found dependency in view definition: %s uses %s", view, other_view)
+                    logger.debug("  %s is at level %s, so %s should be at level %s", other_view, other_view_level, view, new_level)
 
                     # Update view level and source if we found a closer relationship
-                    if complete_chains[table][view]['level'] < new_level:
-                        logger.debug(f"  Updating {view} level from {complete_chains[table][view]['level']} to {new_level}")
-                        logger.debug(f"  Updating {view} source from {complete_chains[table][view]['source']} to {other_view}")
-                        complete_chains[table][view]['level'] = new_level
-                        complete_chains[table][view]['source'] = other_view
+                    if chain[view]['level'] < new_level:
+                        logger.debug("  Updating %s level from %s to %s", view, chain[view]['level'], new_level)
+                        logger.debug("  Updating %s source from %s to %s", view, chain[view]['source'], other_view)
+                        chain[view]['level'] = new_level
+                        chain[view]['source'] = other_view
 
-                        # Update children lists
-                        if view not in complete_chains[table][other_view]['children']:
-                            complete_chains[table][other_view]['children'].append(view)
-                            logger.debug(f"  Added {view} as child of {other_view}")
+                        # Update children sets
+                        chain[other_view]['children'].add(view)
+                        logger.debug("  Added %s as child of %s", view, other_view)
 
     # If we have a dependency graph, use it to enhance our chain information
     if dependency_graph:
         logger.debug("Using dependency graph to enhance chain information")
-        for table in complete_chains:
-            # For each view in the chain, check if we need to update its level
-            for view_name in list(complete_chains[table].keys()):
-                # Skip the table itself
-                if view_name == table:
-                    continue
-
-                # Use the dependency graph to find the actual path length
-                path = find_path_in_graph(dependency_graph, table, view_name)
-                if path:
-                    # The level is the path length (number of hops)
-                    logger.debug(f"Found path in graph: {table} -> {view_name}: {path}")
-                    logger.debug(f"  Path length: {len(path)}, setting level to {len(path) - 1}")
-                    complete_chains[table][view_name]['level'] = len(path) - 1
-
-                    # If this is a multi-level view, find its immediate source
-                    if len(path) > 2:
-                        logger.debug(f"  Multi-level view, immediate source is {path[-2]}")
-                        complete_chains[table][view_name]['source'] = path[-2]
-                else:
-                    logger.debug(f"No path found in graph: {table} -> {view_name}")
-
-    # Debug specifically for health_metrics_raw
-    if 'health_metrics_raw' in complete_chains:
-        logger.debug("HEALTH METRICS CHAIN DETAILS:")
-        for view, details in complete_chains['health_metrics_raw'].items():
-            logger.debug(f"  View: {view}")
-            logger.debug(f"    Level: {details['level']}")
-            logger.debug(f"    Source: {details['source']}")
-            logger.debug(f"    Children: {details['children']}")
-    else:
-        logger.debug("health_metrics_raw not found in complete_chains")
+        for table, chain in complete_chains.items():
+            assign_levels_from_graph(chain, dependency_graph, table)
 
-    logger.debug(f"Final chains built for {len(complete_chains)} tables")
+    logger.debug("Final chains built for %s tables", len(complete_chains))
     return complete_chains
 
-def find_path_in_graph(graph, start, end, path=None):
+def assign_levels_from_graph(chain, graph, base_table):
+    """Set the level and immediate source of every view in a chain from the dependency graph
+
+    Args:
+        chain (dict): Chain entries for one base table, as built by build_aggregate_chains
+        graph (dict): Graph representation where keys are nodes and values are lists of neighbors
+        base_table (str): The base table the chain starts from
+
+    Returns:
+        dict: The same chain, updated in place
+    """
+    # One sweep finds the shortest path to every view in the chain
+    paths = shortest_paths_from(graph, base_table)
+
+    for view_name, view_info in chain.items():
+        # Skip the table itself
+        if view_name == base_table:
+            continue
+
+        # Use the dependency graph to find the actual path length
+        path = paths.get(view_name)
+        if path:
+            # The level is the path length (number of hops)
+            logger.debug("Found path in graph: %s -> %s: %s", base_table, view_name, path)
+            logger.debug("  Path length: %s, setting level to %s", len(path), len(path) - 1)
+            view_info['level'] = len(path) - 1
+
+            # If this is a multi-level view, find its immediate source
+            if len(path) > 2:
+                logger.debug("  Multi-level view, immediate source is %s", path[-2])
+                view_info['source'] = path[-2]
+        else:
+            logger.debug("No path found in graph: %s -> %s", base_table, view_name)
+
+    return chain
+
+def shortest_paths_from(graph, start):
+    """Find the shortest path from start to every reachable node using breadth-first search
+
+    Args:
+        graph (dict): Graph representation where keys are nodes and values are lists of neighbors
+        start (str): Starting node
+
+    Returns:
+        dict: Paths from start (lists of nodes, starting with start) keyed by end node
+    """
+    paths = {start: [start]}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbor in graph.get(node, []):
+            if neighbor not in paths:
+                paths[neighbor] = paths[node] + [neighbor]
+                queue.append(neighbor)
+    return paths
+
+def find_path_in_graph(graph, start, end):
     """Find a path from start to end in a graph using depth-first search
 
     Args:
         graph (dict): Graph representation where keys are nodes and values are lists of neighbors
         start (str): Starting node
         end (str): Ending node
-        path (list, optional): Current path being explored
 
     Returns:
         list: Path from start to end or None if no path exists
     """
-    if path is None:
-        path = []
+    # One shared path, extended and unwound as the search backtracks
+    path = []
+    on_path = set()
+
+    def visit(node):
+        path.append(node)
+        on_path.add(node)
+
+        # If we've reached the end, keep the path
+        if node == end:
+            return True
 
-    # Make a copy of the path to avoid modifying the original
-    path = path + [start]
+        # Try all neighbors not already on the path
+        for neighbor in graph.get(node, ()):
+            if neighbor not in on_path and visit(neighbor):
+                return True
 
-    # If we've reached the end, return the path
-    if start == end:
-        return path
+        path.pop()
+        on_path.remove(node)
+        return False
 
-    # If start isn't in the graph, there's no path
-    if start not in graph:
-        return None
+    return path if visit(start) else None
 
-    # Try all neighbors
-    for node in graph.get(start, []):
-        # Skip already visited nodes
-        if node not in path:
-            # Recursively find path
-            new_path = find_path_in_graph(graph, node, end, path)
-            if new_path:
-                return new_path
+# Indentation for chain levels 1-16; deeper levels are built on demand
+_INDENTS = tuple("    " * i for i in range(16))
 
-    # No path found
-    return None
+def _chain_sort_key(item):
+    """Sort key placing chain views by level, then by name"""
+    view_name, view_info = item
+    return view_info['level'], view_name
 
 def format_aggregate_chain(chains, base_table):
     """Format the aggregate chain for display in the report
@@ -254,24 +350,12 @@ def format_aggregate_chain(chains, base_table):
         str: Formatted chain suitable for Markdown inclusion
     """
     if base_table not in chains:
-        logger.debug(f"No chain found for base table {base_table}")
+        logger.debug("No chain found for base table %s", base_table)
         return ""
 
     # Get all views in the chain
     views = chains[base_table]
-    logger.debug(f"Formatting chain for {base_table} with {len(views)} views")
-
-    # Build a tree structure
-    tree = {}
-
-    # First, group views by level
-    level_groups = {}
-    for view_name, view_info in views.items():
-        level = view_info['level']
-        if level not in level_groups:
-            level_groups[level] = []
-        level_groups[level].append((view_name, view_info))
-        logger.debug(f"  {view_name} at level {level}")
+    logger.debug("Formatting chain for %s with %s views", base_table, len(views))
 
     # Build the chain text
     lines = []
@@ -280,32 +364,34 @@ def format_aggregate_chain(chains, base_table):
     base_table_text = get_string("report.values.base_table", "base table")
     lines.append(f"`{base_table}` ({base_table_text})")
 
-    # Add each level, indented appropriately
-    for level in sorted(level_groups.keys()):
-        for view_name, view_info in sorted(level_groups[level]):
-            source = view_info['source']
-            indent = "    " * (level - 1)
-
-            level_text = get_string("report.values.level", "level")
-            sourced_text = get_string("report.values.sourced_from", "sourced from")
+    # Labels are the same for every view, so look them up once
+    level_text = get_string("report.values.level", "level")
+    sourced_text = get_string("report.values.sourced_from", "sourced from")
 
-            lines.append(f"{indent}↳ `{view_name}` ({level_text} {level}, {sourced_text} `{source}`)")
-            logger.debug(f"  Added line: {indent}↳ {view_name} (level {level}, from {source})")
+    # Add each view ordered by level, then name, indented by level
+    for view_name, view_info in sorted(views.items(), key=_chain_sort_key):
+        level = view_info['level']
+        source = view_info['source']
+        indent = _INDENTS[level - 1] if level <= len(_INDENTS) else "    " * (level - 1)
+        lines.append(f"{indent}↳ `{view_name}` ({level_text} {level}, {sourced_text} `{source}`)")
+        logger.debug("  Added line: %s↳ %s (level %s, from %s)", indent, view_name, level, source)
 
     return "\n".join(lines)
 
-def get_continuous_aggregates_for_table(db_params, table_name, agg_info=None):
+def get_continuous_aggregates_for_table(db_params, table_name, agg_info=None, chains=None):
     """Get all continuous aggregates for a table, including chained ones
 
     Args:
         db_params (dict): Database connection parameters
         table_name (str): Table name to get aggregates for
         agg_info (dict): Optional pre-loaded aggregate information
+        chains (dict): Optional chains from build_aggregate_chains for agg_info;
+            pass them when calling this for many tables, as they cover all tables
 
     Returns:
         dict: Dictionary with direct and indirect continuous aggregates
     """
-    logger.debug(f"Getting continuous aggregates for table {table_name}")
+    logger.debug("Getting continuous aggregates for table %s", table_name)
 
     # If we don't have pre-loaded aggregate info, get it now
     if not agg_info:
@@ -321,23 +407,14 @@ def get_continuous_aggregates_for_table(db_params, table_name, agg_info=None):
     view_definitions = agg_info.get('view_definitions', {})
     dependency_graph = agg_info.get('dependency_graph', {})
 
-    logger.debug(f"agg_chain has {len(agg_chain)} entries")
-    logger.debug(f"view_definitions has {len(view_definitions)} entries")
+    logger.debug("agg_chain has %s entries", len(agg_chain))
+    logger.debug("view_definitions has %s entries", len(view_definitions))
     if dependency_graph:
-        logger.debug(f"dependency_graph has {len(dependency_graph)} nodes")
-
-    # Debug view definitions for health metrics views
-    for view_name in ['health_metrics_1min_cagg', 'health_metrics_1hour_cagg', 'health_metrics_1day_cagg']:
-        if view_name in view_definitions:
-            definition = view_definitions[view_name]
-            logger.debug(f"{view_name} definition exists: {len(definition)} chars")
-            # Check what it references
-            for other_view in ['health_metrics_raw', 'health_metrics_1min_cagg', 'health_metrics_1hour_cagg']:
-                if other_view in definition:
-                    logger.debug(f"  - Definition of {view_name} references {other_view}")
+        logger.debug("dependency_graph has %s nodes", len(dependency_graph))
 
     # Build complete chains
-    chains = build_aggregate_chains(agg_chain, view_definitions, dependency_graph)
+    if chains is None:
+        chains = build_aggregate_chains(agg_chain, view_definitions, dependency_graph)
 
     # Prepare result
     result = {
@@ -348,34 +425,34 @@ def get_continuous_aggregates_for_table(db_params, table_name, agg_info=None):
 
     # Get direct and indirect aggregates for this table
     if table_name in agg_chain:
-        logger.debug(f"Found table {table_name} in agg_chain")
+        logger.debug("Found table %s in agg_chain", table_name)
         if 'direct' in agg_chain[table_name]:
             result['direct'] = agg_chain[table_name]['direct']
-            logger.debug(f"  Direct aggregates: {result['direct']}")
+            logger.debug("  Direct aggregates: %s", result['direct'])
         if 'indirect' in agg_chain[table_name]:
             result['indirect'] = agg_chain[table_name]['indirect']
-            logger.debug(f"  Indirect aggregates: {result['indirect']}")
+            logger.debug("  Indirect aggregates: %s", result['indirect'])
     else:
-        logger.debug(f"Table {table_name} not found in agg_chain")
+        logger.debug("Table %s not found in agg_chain", table_name)
 
     # If we couldn't find any aggregates, try the fallback method
     if not result['direct'] and not result['indirect']:
-        logger.debug(f"No aggregates found for {table_name}, trying fallback method")
+        logger.debug("No aggregates found for %s, trying fallback method", table_name)
         try:
             direct_aggs = get_continuous_aggregates(db_params, table_name)
             if direct_aggs:
-                logger.debug(f"Fallback found {len(direct_aggs)} direct aggregates")
+                logger.debug("Fallback found %s direct aggregates", len(direct_aggs))
                 for agg in direct_aggs:
                     if 'view_short_name' in agg:
                         result['direct'].append(agg['view_short_name'])
-                        logger.debug(f"  Added direct: {agg['view_short_name']}")
+                        logger.debug("  Added direct: %s", agg['view_short_name'])
                     elif 'view_name' in agg:
                         # Extract just the name part if it includes schema
                         view_name = agg['view_name']
                         if '.' in view_name:
                             view_name = view_name.split('.')[-1]
                         result['direct'].append(view_name)
-                        logger.debug(f"  Added direct: {view_name}")
+                        logger.debug("  Added direct: %s", view_name)
             else:
                 logger.debug("Fallback method found no aggregates")
         except Exception as e:
@@ -383,21 +460,62 @@ def get_continuous_aggregates_for_table(db_params, table_name, agg_info=None):
 
     return result
 
-def generate_markdown(db_params, output_file):
+def generate_markdown(db_params, output_file=None):
     """Generate schema-focused markdown report
 
+    The report is assembled in memory and written with a single write rather
+    than streamed, because callers also convert the returned text to HTML.
+    Section lines are collected in a list and joined once at the end.
+
     Args:
         db_params (dict): Database connection parameters
-        output_file (str): Output file path
+        output_file (str, optional): Output file path; if omitted nothing is written
 
     Returns:
-        bool: True if report generated successfully
+        str: The Markdown report content
     """
-    tables = get_all_tables(db_params)
-    timescaledb_version = get_timescaledb_version(db_params)
+    # Hypertable, policy and extension/schema/version results are cached per
+    # run; start from a clean slate
+    clear_existence_cache()
+    clear_hypertable_cache()
+    clear_policy_cache()
+    # Purposes come from the strings config, which may have been reloaded
+    clear_purpose_caches()
+
+    # Every hypertable/policy probe checks for these, so resolve them in one round-trip
+    prefetch_existence_checks(db_params, ['timescaledb'], ['timescaledb_information'])
+
+    # These metadata and statistics lookups are independent, so overlap their
+    # round-trips. Columns and indexes come for all tables at once rather than
+    # per table. Each worker holds at most one pooled connection at a time, so
+    # more workers than the pool has connections would only wait for one.
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        tables_future = executor.submit(get_all_tables, db_params)
+        version_future = executor.submit(get_timescaledb_version, db_params)
+        size_future = executor.submit(get_database_size_info, db_params)
+        schemas_future = executor.submit(get_all_table_schemas, db_params)
+        indexes_future = executor.submit(get_all_indexes, db_params)
+        # The health score's collectors, shared with the sections listing them
+        unused_future = executor.submit(get_unused_indexes, db_params)
+        bloated_future = executor.submit(get_bloated_tables, db_params)
+        conn_stats_future = executor.submit(get_connection_statistics, db_params)
+        slow_queries_future = executor.submit(get_slow_queries, db_params, limit=10)
+        compression_future = executor.submit(get_compression_statistics, db_params)
+        uncompressed_future = executor.submit(get_uncompressed_hypertables, db_params)
+    tables = tables_future.result()
+    timescaledb_version = version_future.result()
+    db_size_info = size_future.result()
+    schemas = schemas_future.result()
+    all_indexes = indexes_future.result()
+
+    # Hypertable details for every table in one probe; None for regular tables
+    hypertable_infos = get_hypertable_info_many(db_params, tables)
 
     logger.info(get_string("log_messages.found_tables", "Found {count} tables", count=len(tables)))
 
+    # The table of contents and the table sections share one ordering
+    sorted_tables = sorted(tables)
+
     # Get all continuous aggregate relationships
     try:
         logger.debug(get_string("log_messages.retrieving_aggregates",
@@ -420,6 +538,9 @@ def generate_markdown(db_params, output_file):
         view_definitions = {}
         dependency_graph = {}
 
+    # The chains cover every base table, so build them once for the whole report
+    all_chains = build_aggregate_chains(agg_chain, view_definitions, dependency_graph)
+
     # Build the report content
     content = []
 
@@ -439,7 +560,9 @@ def generate_markdown(db_params, output_file):
     content.append(f"## {get_string('report.executive_summary.header', 'Executive Summary')}\n")
     
     # Get health score and metrics
-    health_info = get_database_health_score(db_params)
+    health_info = score_database_health(unused_future.result(), bloated_future.result(),
+                                        uncompressed_future.result(),
+                                        average_exec_time(slow_queries_future.result()))
     if health_info['score'] is not None:
         content.append(get_string("report.executive_summary.database_health", 
                                  "Database Health Score: {score}/100",
@@ -461,25 +584,22 @@ def generate_markdown(db_params, output_file):
     # Key metrics
     content.append(f"### {get_string('report.executive_summary.key_metrics', 'Key Metrics')}")
     
-    # Get database size
-    from timescaledb_report.db import get_database_size_info
-    db_size_info = get_database_size_info(db_params)
+    # Database size
     if db_size_info:
         content.append(f"- {get_string('report.executive_summary.total_size', 'Total Database Size: {size}', size=db_size_info['total_size'])}")
     
     # Count continuous aggregates
-    agg_count = len([t for t in agg_chain.values() if t.get('direct') or t.get('indirect')])
+    agg_count = sum(1 for t in agg_chain.values() if t.get('direct') or t.get('indirect'))
     content.append(f"- {get_string('report.executive_summary.continuous_aggregate_count', 'Continuous Aggregates: {count}', count=agg_count)}")
     
     # Count indexes
     total_indexes = 0
     for table in tables:
-        indexes = get_indexes(db_params, table)
-        total_indexes += len(indexes)
+        total_indexes += len(all_indexes.get(table, {}))
     content.append(f"- {get_string('report.executive_summary.index_count', 'Total Indexes: {count}', count=total_indexes)}")
     
     # Count unused indexes
-    unused_indexes = get_unused_indexes(db_params)
+    unused_indexes = unused_future.result()
     if unused_indexes:
         content.append(f"- {get_string('report.executive_summary.unused_index_count', 'Unused Indexes: {count}', count=len(unused_indexes))}")
     
@@ -495,7 +615,7 @@ def generate_markdown(db_params, output_file):
     # Count hypertables and regular tables
     hypertable_count = 0
     for table in tables:
-        if is_hypertable(db_params, table):
+        if hypertable_infos.get(table) is not None:
             hypertable_count += 1
 
     content.append(get_string("report.overview.hypertable_count",
@@ -513,14 +633,14 @@ def generate_markdown(db_params, output_file):
     content.append("")  # Empty line
 
     # Add table of contents
-    content.append(generate_toc(tables))
+    content.append(generate_toc(sorted_tables, already_sorted=True))
     content.append("\n")
     
     # Performance Metrics Section
     content.append(f"\n## {get_string('report.performance.header', 'Performance Metrics')}\n")
     
     # Connection statistics
-    conn_stats = get_connection_statistics(db_params)
+    conn_stats = conn_stats_future.result()
     if conn_stats:
         content.append(f"### {get_string('report.performance.connection_statistics', 'Connection Statistics')}")
         conn_headers = ["State", "Count", "Max Duration"]
@@ -532,7 +652,7 @@ def generate_markdown(db_params, output_file):
         content.append("")
     
     # Slow queries
-    slow_queries = get_slow_queries(db_params, limit=10)
+    slow_queries = slow_queries_future.result()
     if slow_queries:
         content.append(f"### {get_string('report.performance.slow_queries', 'Slowest Queries (by average execution time)')}")
         query_headers = ["Query Preview", "Calls", "Avg Time (ms)", "Total Time (ms)"]
@@ -551,7 +671,7 @@ def generate_markdown(db_params, output_file):
     content.append(f"\n## {get_string('report.storage.header', 'Storage Optimization')}\n")
     
     # Compression statistics
-    compression_stats = get_compression_statistics(db_params)
+    compression_stats = compression_future.result()
     if compression_stats:
         content.append(f"### {get_string('report.storage.compression_effectiveness', 'Compression Effectiveness by Table')}")
         comp_headers = ["Table", "Compressed Chunks", "Uncompressed Chunks", "Total Size", "Compression Ratio"]
@@ -565,11 +685,12 @@ def generate_markdown(db_params, output_file):
                 stat['total_size'],
                 ratio
             ])
-        content.append(format_markdown_table(comp_headers, comp_rows))
+        # One row per hypertable; emitted unpadded like the tables summary
+        content.append(_fast_md_table(comp_headers, comp_rows))
         content.append("")
     
     # Uncompressed hypertables
-    uncompressed = get_uncompressed_hypertables(db_params)
+    uncompressed = uncompressed_future.result()
     if uncompressed:
         content.append(f"### {get_string('report.storage.uncompressed_tables', 'Tables Without Compression')}")
         uncomp_headers = ["Table", "Size"]
@@ -592,26 +713,63 @@ def generate_markdown(db_params, output_file):
     none_text = get_string("report.values.none", "None")
     na_text = get_string("report.values.na", "N/A")
 
-    # Collect data for table summary
-    for table in sorted(tables):
+    # Section labels and headers are the same for every table, so look them up once
+    purpose_label = get_string("report.sections.purpose_label", "Purpose")
+    hypertable_label = get_string("report.sections.timescaledb_hypertable_label",
+                                  "TimescaleDB Hypertable")
+    chain_label = get_string("report.sections.continuous_aggregate_chain",
+                             "Continuous Aggregate Chain")
+    direct_aggs_label = get_string("report.sections.direct_continuous_aggregates",
+                                   "Direct Continuous Aggregates")
+    sourced_directly_label = get_string("report.sections.sourced_directly_from",
+                                        "Sourced Directly From")
+    sourced_from_label = get_string("report.sections.sourced_from", "Sourced From")
+    via_text = get_string("report.sections.via", "via")
+    sourced_indirectly_label = get_string("report.sections.sourced_indirectly_from",
+                                          "Sourced Indirectly From")
+    schema_label = get_string("report.sections.schema", "Schema")
+    schema_headers = get_string("report.table_headers.schema_headers",
+                                ["Column", "Type", "Nullable", "Purpose"])
+    indexes_label = get_string("report.sections.indexes", "Indexes")
+    idx_headers = get_string("report.table_headers.index_headers",
+                             ["Name", "Columns", "Type", "Purpose"])
+
+    # Index type labels
+    primary_key_text = get_string("report.values.primary_key", "PRIMARY KEY")
+    unique_text = get_string("report.values.unique", "UNIQUE")
+    index_text = get_string("report.values.index", "INDEX")
+
+    # Which base tables each aggregate is sourced from, in agg_chain order, so
+    # each table looks up its sources instead of scanning every chain
+    aggregate_sources = {}
+    for other_table, chain_info in agg_chain.items():
+        direct = set(chain_info.get('direct', []))
+        for agg in dict.fromkeys(chain_info.get('direct', []) + chain_info.get('indirect', [])):
+            if agg != other_table:  # Skip self
+                aggregate_sources.setdefault(agg, []).append((other_table, agg in direct))
+
+    # Which views each view is built from, inverted from the dependency graph
+    reverse_dependencies = defaultdict(set)
+    for parent, children in dependency_graph.items():
+        for child in children:
+            reverse_dependencies[child].add(parent)
+
+    # Build the summary rows and the detail sections in one pass over the tables
+    details = []
+    for table in sorted_tables:
         # Get schema and index info
-        schema = get_table_schema(db_params, table)
-        is_hyper = is_hypertable(db_params, table)
+        schema = schemas.get(table, [])
+        indexes = all_indexes.get(table, {})
+        # None for regular tables, so this doubles as the hypertable check
+        hyper_info = hypertable_infos.get(table)
+        is_hyper = hyper_info is not None
 
         # Check for time column and JSON columns
-        has_time_column = False
-        time_column_name = "time"  # Assume default
-        has_json = False
-
-        for col in schema:
-            if col['name'].lower() == 'time':
-                has_time_column = True
-                time_column_name = col['name']
-            if 'json' in col['type'].lower():
-                has_json = True
+        time_column_name = next((col['name'] for col in schema if col['name'].lower() == 'time'), None)
+        has_json = any('json' in col['type'].lower() for col in schema)
 
         # Get aggregation views - combine direct and indirect
-        aggregates = get_continuous_aggregates_for_table(db_params, table, all_aggs)
+        aggregates = get_continuous_aggregates_for_table(db_params, table, all_aggs, all_chains)
         aggs = aggregates['direct'] + aggregates['indirect']
 
         # Add to table summary
@@ -619,128 +777,79 @@ def generate_markdown(db_params, output_file):
         rows.append([
             table,
             yes_text if is_hyper else no_text,
-            time_column_name if has_time_column else na_text,
+            time_column_name or na_text,
             yes_text if has_json else no_text,
             ", ".join(aggs) if aggs else none_text,
             purpose
         ])
 
-    # Add the table summary
-    content.append(format_markdown_table(headers, rows))
-
-    # Table details section header
-    content.append(f"\n## {get_string('report.sections.table_details', 'Table Details')}\n")
-
-    # Add table details
-    for table in sorted(tables):
-        # Get schema and index info
-        schema = get_table_schema(db_params, table)
-        indexes = get_indexes(db_params, table)
-        is_hyper = is_hypertable(db_params, table)
-
-        # Check for JSON columns
-        has_json = False
-        for col in schema:
-            if 'json' in col['type'].lower():
-                has_json = True
-                break
-
         # Get aggregation information
-        aggregates = get_continuous_aggregates_for_table(db_params, table, all_aggs)
         direct_aggs = aggregates['direct']
         indirect_aggs = aggregates['indirect']
         complete_chains = aggregates.get('complete_chains', {})
 
+        # Each table's detail lines are joined into one block as the table closes
+        section = []
+
         # Add anchor and table name - use the table name directly as the ID
         anchor = table.lower()
-        content.append(f"### {table} {{#{anchor}}}\n")
+        section.append(f"### {table} {{#{anchor}}}\n")
 
         # Add table purpose description
-        purpose = get_table_purpose(table)
-        purpose_label = get_string("report.sections.purpose_label", "Purpose")
-        content.append(f"**{purpose_label}:** {purpose}\n")
+        section.append(f"**{purpose_label}:** {purpose}\n")
 
         # Add TimescaleDB info if applicable
-        if is_hyper:
-            hyper_info = get_hypertable_info(db_params, table)
-            time_column = hyper_info.get('time_column') if hyper_info else None
-
-            hypertable_label = get_string("report.sections.timescaledb_hypertable_label",
-                                         "TimescaleDB Hypertable")
+        if hyper_info is not None:
+            time_column = hyper_info.get('time_column')
 
             if time_column:
-                content.append(f"**{hypertable_label}:** {yes_text}, using `{time_column}` as time column\n")
+                section.append(f"**{hypertable_label}:** {yes_text}, using `{time_column}` as time column\n")
             else:
-                content.append(f"**{hypertable_label}:** {yes_text}\n")
+                section.append(f"**{hypertable_label}:** {yes_text}\n")
 
             # Display continuous aggregates with hierarchy information
             if direct_aggs or indirect_aggs:
                 # If we have both direct and indirect aggregates, we're a base table for an aggregate chain
                 # Use the formatted aggregate chain for more clarity
                 if table in complete_chains:
-                    logger.debug(f"Formatting aggregate chain for {table}")
-
-                    chain_label = get_string("report.sections.continuous_aggregate_chain",
-                                           "Continuous Aggregate Chain")
+                    logger.debug("Formatting aggregate chain for %s", table)
 
-                    content.append(f"**{chain_label}:**\n")
-                    content.append("```")
+                    section.append(f"**{chain_label}:**\n")
+                    section.append("```")
                     chain_text = format_aggregate_chain(complete_chains, table)
-                    content.append(chain_text)
-                    content.append("```\n")
-                    logger.debug(f"Generated chain text:\n{chain_text}")
+                    section.append(chain_text)
+                    section.append("```\n")
+                    logger.debug("Generated chain text:\n%s", chain_text)
                 else:
                     # Just list direct aggregates as before
                     if direct_aggs:
-                        agg_list = ", ".join([f"`{agg}`" for agg in direct_aggs])
+                        agg_list = "`" + "`, `".join(direct_aggs) + "`"
 
-                        direct_aggs_label = get_string("report.sections.direct_continuous_aggregates",
-                                                      "Direct Continuous Aggregates")
-
-                        content.append(f"**{direct_aggs_label}:** {agg_list}\n")
-                        logger.debug(f"Listed direct aggregates for {table}: {direct_aggs}")
+                        section.append(f"**{direct_aggs_label}:** {agg_list}\n")
+                        logger.debug("Listed direct aggregates for %s: %s", table, direct_aggs)
 
             # Display aggregate sources if this table is itself an aggregate
-            for other_table in agg_chain:
-                if other_table != table:  # Skip self
-                    # Check if this table is a direct or indirect aggregate of other_table
-                    if table in agg_chain[other_table].get('direct', []):
-                        sourced_directly_label = get_string("report.sections.sourced_directly_from",
-                                                           "Sourced Directly From")
-
-                        content.append(f"**{sourced_directly_label}:** `{other_table}`\n")
-                        logger.debug(f"{table} is sourced directly from {other_table}")
-                    elif table in agg_chain[other_table].get('indirect', []):
-                        # Find immediate source
-                        immediate_source = None
-                        if dependency_graph:
-                            # Check each direct aggregate of other_table
-                            for direct_agg in agg_chain[other_table].get('direct', []):
-                                if table in dependency_graph.get(direct_agg, []):
-                                    immediate_source = direct_agg
-                                    break
-
-                        # If found, mention the path
-                        if immediate_source:
-                            sourced_from_label = get_string("report.sections.sourced_from",
-                                                           "Sourced From")
-                            via_text = get_string("report.sections.via", "via")
-
-                            content.append(f"**{sourced_from_label}:** `{other_table}` {via_text} `{immediate_source}`\n")
-                            logger.debug(f"{table} is sourced from {other_table} via {immediate_source}")
-                        else:
-                            sourced_indirectly_label = get_string("report.sections.sourced_indirectly_from",
-                                                                 "Sourced Indirectly From")
-
-                            content.append(f"**{sourced_indirectly_label}:** `{other_table}`\n")
-                            logger.debug(f"{table} is sourced indirectly from {other_table}")
+            for other_table, is_direct in aggregate_sources.get(table, ()):
+                # Check if this table is a direct or indirect aggregate of other_table
+                if is_direct:
+                    section.append(f"**{sourced_directly_label}:** `{other_table}`\n")
+                    logger.debug("%s is sourced directly from %s", table, other_table)
+                else:
+                    # Find immediate source: the first direct aggregate of other_table feeding this one
+                    feeding_views = reverse_dependencies.get(table, ())
+                    immediate_source = next((direct_agg for direct_agg in agg_chain[other_table].get('direct', [])
+                                             if direct_agg in feeding_views), None)
+
+                    # If found, mention the path
+                    if immediate_source:
+                        section.append(f"**{sourced_from_label}:** `{other_table}` {via_text} `{immediate_source}`\n")
+                        logger.debug("%s is sourced from %s via %s", table, other_table, immediate_source)
+                    else:
+                        section.append(f"**{sourced_indirectly_label}:** `{other_table}`\n")
+                        logger.debug("%s is sourced indirectly from %s", table, other_table)
 
         # Schema information
-        schema_label = get_string("report.sections.schema", "Schema")
-        content.append(f"#### {schema_label}\n")
-
-        schema_headers = get_string("report.table_headers.schema_headers",
-                                   ["Column", "Type", "Nullable", "Purpose"])
+        section.append(f"#### {schema_label}\n")
         schema_rows = []
 
         for col in schema:
@@ -754,23 +863,14 @@ def generate_markdown(db_params, output_file):
                 purpose
             ])
 
-        content.append(format_markdown_table(schema_headers, schema_rows))
-        content.append("")
+        section.append(format_markdown_table(schema_headers, schema_rows))
+        section.append("")
 
         # Index information
         if indexes:
-            indexes_label = get_string("report.sections.indexes", "Indexes")
-            content.append(f"\n#### {indexes_label}\n")
-
-            idx_headers = get_string("report.table_headers.index_headers",
-                                    ["Name", "Columns", "Type", "Purpose"])
+            section.append(f"\n#### {indexes_label}\n")
             idx_rows = []
 
-            # Get index type labels
-            primary_key_text = get_string("report.values.primary_key", "PRIMARY KEY")
-            unique_text = get_string("report.values.unique", "UNIQUE")
-            index_text = get_string("report.values.index", "INDEX")
-
             for idx_name, idx_info in indexes.items():
                 idx_type = primary_key_text if idx_info['is_primary'] else unique_text if idx_info['is_unique'] else index_text
                 columns = ", ".join(idx_info['columns'])
@@ -781,16 +881,27 @@ def generate_markdown(db_params, output_file):
 
                 idx_rows.append([idx_name, columns, idx_type, purpose])
 
-            content.append(format_markdown_table(idx_headers, idx_rows))
-            content.append("")
+            section.append(format_markdown_table(idx_headers, idx_rows))
+            section.append("")
 
-        content.append("\n---\n")
+        section.append("\n---\n")
+        details.append("\n".join(section))
 
-    # Write the report
-    with open(output_file, 'w') as f:
-        f.write('\n'.join(content))
+    # Add the table summary; one row per table, so skip tabulate's padding pass
+    content.append(_fast_md_table(headers, rows))
 
-    logger.info(get_string("log_messages.report_written",
-                          "Report written to {file}",
-                          file=output_file))
-    return True
+    # Table details section header
+    content.append(f"\n## {get_string('report.sections.table_details', 'Table Details')}\n")
+    content.extend(details)
+
+    md_content = '\n'.join(content)
+
+    # Write the report
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(md_content)
+
+        logger.info(get_string("log_messages.report_written",
+                              "Report written to {file}",
+                              file=output_file))
+    return md_content
@@ -3,8 +3,8 @@ Functions for retrieving database schema information.
 """
 
 import logging
-import psycopg2
-from timescaledb_report.strings import get_string
+from itertools import groupby
+from operator import itemgetter
 from timescaledb_report.db import safe_query
 
 logger = logging.getLogger(__name__)
@@ -18,20 +18,26 @@ def get_all_tables(db_params):
     Returns:
         list: List of table names
     """
-    # Use a separate connection to avoid transaction issues
-    new_conn = None
-    try:
-        new_conn = psycopg2.connect(**db_params)
-        with new_conn.cursor() as cur:
-            cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public';")
-            tables = cur.fetchall()
-        return [table[0] for table in tables]
-    except psycopg2.Error as e:
-        logger.error(f"Error getting tables: {e}")
-        return []
-    finally:
-        if new_conn:
-            new_conn.close()
+    tables = safe_query(
+        db_params,
+        "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public';",
+        row_factory=tuple
+    )
+    return [table[0] for table in tables]
+
+def _format_column(col_name, data_type, max_length, nullable, default):
+    """Turn an information_schema.columns row into a column dictionary"""
+    if max_length:
+        data_type = f"{data_type}({max_length})"
+    nullable_str = "NULL" if nullable == "YES" else "NOT NULL"
+    default_str = f"{default}" if default else ""
+
+    return {
+        "name": col_name,
+        "type": data_type,
+        "nullable": nullable_str,
+        "default": default_str
+    }
 
 def get_table_schema(db_params, table_name):
     """Get the schema (columns and data types) for a given table
@@ -43,48 +49,24 @@ def get_table_schema(db_params, table_name):
     Returns:
         list: List of column dictionaries with name, type, nullable, and default
     """
-    # Use a separate connection to avoid transaction issues
-    new_conn = None
-    try:
-        new_conn = psycopg2.connect(**db_params)
-        with new_conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    column_name,
-                    data_type,
-                    character_maximum_length,
-                    is_nullable,
-                    column_default
-                FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = %s
-                ORDER BY ordinal_position;
-            """, (table_name,))
-            columns = cur.fetchall()
-
-        schema_info = []
-        for col in columns:
-            col_name, data_type, max_length, nullable, default = col
-            if max_length:
-                data_type = f"{data_type}({max_length})"
-            nullable_str = "NULL" if nullable == "YES" else "NOT NULL"
-            default_str = f"{default}" if default else ""
-
-            schema_info.append({
-                "name": col_name,
-                "type": data_type,
-                "nullable": nullable_str,
-                "default": default_str
-            })
-
-        return schema_info
-    except psycopg2.Error as e:
-        logger.warning(get_string("log_messages.error_schema_table",
-                                 "Error getting table schema for {table}: {error}",
-                                 table=table_name, error=e))
-        return []
-    finally:
-        if new_conn:
-            new_conn.close()
+    columns = safe_query(
+        db_params,
+        """
+        SELECT
+            column_name,
+            data_type,
+            character_maximum_length,
+            is_nullable,
+            column_default
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+        ORDER BY ordinal_position;
+        """,
+        (table_name,),
+        row_factory=tuple
+    )
+
+    return [_format_column(*col) for col in columns]
 
 def get_indexes(db_params, table_name):
     """Get index information for a given table
@@ -124,8 +106,12 @@ def get_indexes(db_params, table_name):
         (table_name,)
     )
 
+    return _group_index_rows(result)
+
+def _group_index_rows(rows):
+    """Group one-row-per-column index query results by index name"""
     indexes = {}
-    for r in result:
+    for r in rows:
         idx_name = r['index_name']
         if idx_name not in indexes:
             indexes[idx_name] = {
@@ -136,3 +122,74 @@ def get_indexes(db_params, table_name):
         indexes[idx_name]['columns'].append(r['column_name'])
 
     return indexes
+
+def get_all_table_schemas(db_params):
+    """Get the schema of every table in the public schema in one query
+
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        dict: Column dictionary lists, as from ``get_table_schema``, keyed by table name
+    """
+    result = safe_query(
+        db_params,
+        """
+        SELECT
+            table_name,
+            column_name,
+            data_type,
+            character_maximum_length,
+            is_nullable,
+            column_default
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        ORDER BY table_name, ordinal_position;
+        """,
+        row_factory=tuple
+    )
+
+    # Rows arrive ordered by table, so each table's columns are one run
+    return {table_name: [_format_column(*col[1:]) for col in columns]
+            for table_name, columns in groupby(result, key=itemgetter(0))}
+
+def get_all_indexes(db_params):
+    """Get index information for every table in the public schema in one query
+
+    Args:
+        db_params (dict): Database connection parameters
+
+    Returns:
+        dict: Index dictionaries, as from ``get_indexes``, keyed by table name
+    """
+    result = safe_query(
+        db_params,
+        """
+        SELECT
+            t.relname as table_name,
+            i.relname as index_name,
+            a.attname as column_name,
+            ix.indisunique as is_unique,
+            ix.indisprimary as is_primary
+        FROM
+            pg_class t,
+            pg_class i,
+            pg_index ix,
+            pg_attribute a
+        WHERE
+            t.oid = ix.indrelid
+            AND i.oid = ix.indexrelid
+            AND a.attrelid = t.oid
+            AND a.attnum = ANY(ix.indkey)
+            AND t.relkind = 'r'
+            AND t.relnamespace = 'public'::regnamespace
+        ORDER BY
+            t.relname,
+            i.relname,
+            array_position(ix.indkey, a.attnum);
+        """
+    )
+
+    # Rows arrive ordered by table, so each table's index rows are one run
+    return {table_name: _group_index_rows(rows)
+            for table_name, rows in groupby(result, key=itemgetter('table_name'))}
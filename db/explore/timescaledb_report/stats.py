@@ -3,42 +3,27 @@ Enhanced database statistics collection for comprehensive reporting.
 """
 
 import logging
-from timescaledb_report.db import safe_query
+from concurrent.futures import ThreadPoolExecutor
+from timescaledb_report.db import POOL_SIZE, safe_query, safe_query_iter
 
 logger = logging.getLogger(__name__)
 
-def execute_query(db_params, query):
+# Threads get_database_health_score runs its four collectors on; each holds
+# one pooled connection, and borrowing waits while the pool is busy
+HEALTH_SCORE_WORKERS = min(4, POOL_SIZE)
+
+def execute_query(db_params, query, params=None):
     """Execute a query and return results as list of tuples.
     
     Args:
         db_params (dict): Database connection parameters
         query (str): SQL query to execute
+        params (tuple, optional): Parameters for the query
         
     Returns:
         list: Query results as list of tuples
     """
-    result = safe_query(db_params, query)
-    if result:
-        # Convert DictRow results to tuples - handle different row types
-        try:
-            # Try to convert each row properly
-            converted_results = []
-            for row in result:
-                if hasattr(row, 'values'):
-                    # DictRow has values() method
-                    converted_results.append(tuple(row.values()))
-                elif hasattr(row, '__iter__'):
-                    # Already a tuple or list
-                    converted_results.append(tuple(row))
-                else:
-                    # Fallback - convert to list first
-                    converted_results.append(tuple(list(row)))
-            return converted_results
-        except Exception as e:
-            logger.error(f"Error converting query results: {e}")
-            # Try a simpler conversion
-            return [tuple(row) for row in result]
-    return []
+    return safe_query(db_params, query, params, row_factory=tuple)
 
 def get_database_health_score(db_params):
     """Calculate an overall database health score based on various metrics.
@@ -46,6 +31,32 @@ def get_database_health_score(db_params):
     Args:
         db_params (dict): Database connection parameters
         
+    Returns:
+        dict: Health score and contributing factors
+    """
+    # The collectors are independent queries, so overlap their round-trips
+    with ThreadPoolExecutor(max_workers=HEALTH_SCORE_WORKERS) as executor:
+        unused_future = executor.submit(get_unused_indexes, db_params)
+        bloated_future = executor.submit(get_bloated_tables, db_params)
+        uncompressed_future = executor.submit(get_uncompressed_hypertables, db_params)
+        slow_future = executor.submit(get_avg_slow_query_time, db_params, top_n=10)
+
+    return score_database_health(unused_future.result(), bloated_future.result(),
+                                 uncompressed_future.result(), slow_future.result())
+
+def score_database_health(unused_indexes, bloated_tables, uncompressed, avg_slow_query_time):
+    """Calculate the database health score from already collected metrics.
+    
+    Lets a caller that also reports these metrics score them without
+    querying them a second time.
+    
+    Args:
+        unused_indexes (list): Result of get_unused_indexes
+        bloated_tables (list): Result of get_bloated_tables
+        uncompressed (list): Result of get_uncompressed_hypertables
+        avg_slow_query_time (float): Average execution time in ms of the 10
+            slowest queries, as from get_avg_slow_query_time, or None
+        
     Returns:
         dict: Health score and contributing factors
     """
@@ -55,33 +66,27 @@ def get_database_health_score(db_params):
     
     try:
         # Check for unused indexes (deduct points for waste)
-        unused_indexes = get_unused_indexes(db_params)
         if unused_indexes:
             deduction = min(len(unused_indexes) * 2, 20)
             score -= deduction
             warnings.append(f"{len(unused_indexes)} unused indexes found")
         
         # Check table bloat
-        bloated_tables = get_bloated_tables(db_params)
         if bloated_tables:
             deduction = min(len(bloated_tables) * 5, 25)
             score -= deduction
             issues.append(f"{len(bloated_tables)} tables with significant bloat")
         
         # Check for tables without compression
-        uncompressed = get_uncompressed_hypertables(db_params)
         if uncompressed:
             deduction = min(len(uncompressed) * 3, 15)
             score -= deduction
             warnings.append(f"{len(uncompressed)} hypertables without compression")
         
         # Check query performance
-        slow_queries = get_slow_queries(db_params, limit=10)
-        if slow_queries:
-            avg_time = sum(q['mean_exec_time'] for q in slow_queries) / len(slow_queries)
-            if avg_time > 1000:  # > 1 second
-                score -= 10
-                issues.append(f"Average slow query time: {avg_time:.1f}ms")
+        if avg_slow_query_time is not None and avg_slow_query_time > 1000:  # > 1 second
+            score -= 10
+            issues.append(f"Average slow query time: {avg_slow_query_time:.1f}ms")
         
         return {
             'score': max(score, 0),
@@ -128,6 +133,12 @@ def get_connection_statistics(db_params):
         logger.error(f"Error getting connection statistics: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_SLOW_QUERY_KEYS = (
+    'query', 'calls', 'mean_exec_time', 'total_exec_time', 'min_exec_time',
+    'max_exec_time', 'stddev_exec_time'
+)
+
 def get_slow_queries(db_params, limit=20):
     """Get slowest queries from pg_stat_statements.
     
@@ -138,7 +149,7 @@ def get_slow_queries(db_params, limit=20):
     Returns:
         list: Slow query information
     """
-    query = f"""
+    query = """
     SELECT 
         LEFT(query, 100) as query_preview,
         calls,
@@ -150,24 +161,56 @@ def get_slow_queries(db_params, limit=20):
     FROM pg_stat_statements
     WHERE query NOT LIKE '%%pg_stat_statements%%'
     ORDER BY mean_exec_time DESC
-    LIMIT {limit}
+    LIMIT %s
     """
     
     try:
-        results = execute_query(db_params, query)
-        return [{
-            'query': row[0],
-            'calls': row[1],
-            'mean_exec_time': row[2],
-            'total_exec_time': row[3],
-            'min_exec_time': row[4],
-            'max_exec_time': row[5],
-            'stddev_exec_time': row[6]
-        } for row in results]
+        results = execute_query(db_params, query, (limit,))
+        return [dict(zip(_SLOW_QUERY_KEYS, row)) for row in results]
     except Exception as e:
         logger.error(f"Error getting slow queries: {e}")
         return []
 
+def get_avg_slow_query_time(db_params, top_n=10):
+    """Get the average execution time of the slowest queries.
+    
+    Args:
+        db_params (dict): Database connection parameters
+        top_n (int): Number of slowest queries to average over
+        
+    Returns:
+        float: Average of their mean execution times in ms, or None if unavailable
+    """
+    query = """
+    SELECT AVG(mean_exec_time)
+    FROM (
+        SELECT mean_exec_time
+        FROM pg_stat_statements
+        WHERE query NOT LIKE '%%pg_stat_statements%%'
+        ORDER BY mean_exec_time DESC
+        LIMIT %s
+    ) slowest
+    """
+    
+    results = execute_query(db_params, query, (top_n,))
+    return results[0][0] if results else None
+
+def average_exec_time(slow_queries):
+    """Average the mean execution times of already fetched slow queries.
+    
+    Args:
+        slow_queries (list): Result of get_slow_queries
+        
+    Returns:
+        float: Average mean execution time in ms, or None if there are none
+    """
+    if not slow_queries:
+        return None
+    return sum(q['mean_exec_time'] for q in slow_queries) / len(slow_queries)
+
+# Result keys, in the column order of the query below
+_UNUSED_INDEX_KEYS = ('schema', 'table', 'index', 'size', 'size_bytes')
+
 def get_unused_indexes(db_params):
     """Get indexes that have never been used.
     
@@ -182,32 +225,31 @@ def get_unused_indexes(db_params):
         n.nspname as schemaname,
         t.relname as tablename,
         i.relname as indexname,
-        pg_size_pretty(pg_relation_size(ui.indexrelid)) as index_size,
-        pg_relation_size(ui.indexrelid) as size_bytes
+        pg_size_pretty(sz.bytes) as index_size,
+        sz.bytes as size_bytes
     FROM pg_stat_user_indexes ui
     JOIN pg_index idx ON idx.indexrelid = ui.indexrelid
     JOIN pg_class i ON i.oid = ui.indexrelid
     JOIN pg_class t ON t.oid = ui.relid
     JOIN pg_namespace n ON n.oid = t.relnamespace
+    -- Size each index once; it is both shown and sorted on
+    CROSS JOIN LATERAL (SELECT pg_relation_size(ui.indexrelid) AS bytes) sz
     WHERE ui.idx_scan = 0
         AND n.nspname = 'public'
         AND i.relname NOT LIKE '%%_pkey'
-    ORDER BY pg_relation_size(ui.indexrelid) DESC
+    ORDER BY sz.bytes DESC
     """
     
     try:
         results = execute_query(db_params, query)
-        return [{
-            'schema': row[0],
-            'table': row[1],
-            'index': row[2],
-            'size': row[3],
-            'size_bytes': row[4]
-        } for row in results]
+        return [dict(zip(_UNUSED_INDEX_KEYS, row)) for row in results]
     except Exception as e:
         logger.error(f"Error getting unused indexes: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_INDEX_USAGE_KEYS = ('schema', 'table', 'index', 'scans', 'tuples_read', 'tuples_fetched', 'size')
+
 def get_index_usage_statistics(db_params):
     """Get detailed index usage statistics.
     
@@ -235,20 +277,20 @@ def get_index_usage_statistics(db_params):
     """
     
     try:
-        results = execute_query(db_params, query)
-        return [{
-            'schema': row[0],
-            'table': row[1],
-            'index': row[2],
-            'scans': row[3],
-            'tuples_read': row[4],
-            'tuples_fetched': row[5],
-            'size': row[6]
-        } for row in results]
+        # Stream rows from a server-side cursor straight into the result dicts
+        rows = safe_query_iter(db_params, query, row_factory=tuple)
+        return [dict(zip(_INDEX_USAGE_KEYS, row)) for row in rows]
     except Exception as e:
         logger.error(f"Error getting index usage statistics: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_ACCESS_PATTERN_KEYS = (
+    'schema', 'table', 'seq_scans', 'seq_tuples_read', 'index_scans',
+    'index_tuples_fetched', 'inserts', 'updates', 'deletes', 'live_tuples',
+    'dead_tuples', 'index_usage_pct'
+)
+
 def get_table_access_patterns(db_params):
     """Get table access patterns showing sequential vs index scans.
     
@@ -283,25 +325,16 @@ def get_table_access_patterns(db_params):
     """
     
     try:
-        results = execute_query(db_params, query)
-        return [{
-            'schema': row[0],
-            'table': row[1],
-            'seq_scans': row[2],
-            'seq_tuples_read': row[3],
-            'index_scans': row[4],
-            'index_tuples_fetched': row[5],
-            'inserts': row[6],
-            'updates': row[7],
-            'deletes': row[8],
-            'live_tuples': row[9],
-            'dead_tuples': row[10],
-            'index_usage_pct': row[11]
-        } for row in results]
+        # Stream rows from a server-side cursor straight into the result dicts
+        rows = safe_query_iter(db_params, query, row_factory=tuple)
+        return [dict(zip(_ACCESS_PATTERN_KEYS, row)) for row in rows]
     except Exception as e:
         logger.error(f"Error getting table access patterns: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_BLOATED_TABLE_KEYS = ('schema', 'table', 'size', 'live_tuples', 'dead_tuples', 'bloat_pct')
+
 def get_bloated_tables(db_params, threshold_pct=20):
     """Identify tables with significant bloat.
     
@@ -312,7 +345,7 @@ def get_bloated_tables(db_params, threshold_pct=20):
     Returns:
         list: Bloated table information
     """
-    query = f"""
+    query = """
     WITH table_bloat AS (
         SELECT 
             n.nspname as schemaname,
@@ -337,20 +370,13 @@ def get_bloated_tables(db_params, threshold_pct=20):
         n_dead_tup,
         bloat_pct
     FROM table_bloat
-    WHERE bloat_pct >= {threshold_pct}
+    WHERE bloat_pct >= %s
     ORDER BY bloat_pct DESC
     """
     
     try:
-        results = execute_query(db_params, query)
-        return [{
-            'schema': row[0],
-            'table': row[1],
-            'size': row[2],
-            'live_tuples': row[3],
-            'dead_tuples': row[4],
-            'bloat_pct': row[5]
-        } for row in results]
+        results = execute_query(db_params, query, (threshold_pct,))
+        return [dict(zip(_BLOATED_TABLE_KEYS, row)) for row in results]
     except Exception as e:
         logger.error(f"Error getting bloated tables: {e}")
         return []
@@ -410,6 +436,9 @@ def get_lock_analysis(db_params):
         logger.error(f"Error getting lock analysis: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_UNCOMPRESSED_KEYS = ('schema', 'table', 'compression_enabled', 'size')
+
 def get_uncompressed_hypertables(db_params):
     """Get hypertables without compression policies.
     
@@ -424,28 +453,31 @@ def get_uncompressed_hypertables(db_params):
         ht.hypertable_schema,
         ht.hypertable_name,
         ht.compression_enabled,
-        pg_size_pretty(pg_total_relation_size(
-            format('%%I.%%I', ht.hypertable_schema, ht.hypertable_name)::regclass
-        )) as table_size
+        pg_size_pretty(sz.bytes) as table_size
     FROM timescaledb_information.hypertables ht
+    -- Size each hypertable once; it is both shown and sorted on
+    CROSS JOIN LATERAL (
+        SELECT pg_total_relation_size(
+            format('%%I.%%I', ht.hypertable_schema, ht.hypertable_name)::regclass
+        ) AS bytes
+    ) sz
     WHERE NOT ht.compression_enabled
-    ORDER BY pg_total_relation_size(
-        format('%%I.%%I', ht.hypertable_schema, ht.hypertable_name)::regclass
-    ) DESC
+    ORDER BY sz.bytes DESC
     """
     
     try:
         results = execute_query(db_params, query)
-        return [{
-            'schema': row[0],
-            'table': row[1],
-            'compression_enabled': row[2],
-            'size': row[3]
-        } for row in results]
+        return [dict(zip(_UNCOMPRESSED_KEYS, row)) for row in results]
     except Exception as e:
         logger.error(f"Error getting uncompressed hypertables: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_COMPRESSION_KEYS = (
+    'table', 'compressed_chunks', 'uncompressed_chunks', 'compressed_size',
+    'uncompressed_size', 'total_size', 'compression_ratio_pct'
+)
+
 def get_compression_statistics(db_params):
     """Get compression effectiveness statistics for all compressed hypertables.
     
@@ -494,19 +526,16 @@ def get_compression_statistics(db_params):
     
     try:
         results = execute_query(db_params, query)
-        return [{
-            'table': row[0],
-            'compressed_chunks': row[1],
-            'uncompressed_chunks': row[2],
-            'compressed_size': row[3],
-            'uncompressed_size': row[4],
-            'total_size': row[5],
-            'compression_ratio_pct': row[6]
-        } for row in results]
+        return [dict(zip(_COMPRESSION_KEYS, row)) for row in results]
     except Exception as e:
         logger.error(f"Error getting compression statistics: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_CHUNK_DISTRIBUTION_KEYS = (
+    'table', 'month', 'chunk_count', 'total_size', 'earliest_data', 'latest_data'
+)
+
 def get_chunk_distribution(db_params):
     """Get chunk distribution over time for all hypertables.
     
@@ -533,19 +562,20 @@ def get_chunk_distribution(db_params):
     """
     
     try:
-        results = execute_query(db_params, query)
-        return [{
-            'table': row[0],
-            'month': row[1],
-            'chunk_count': row[2],
-            'total_size': row[3],
-            'earliest_data': row[4],
-            'latest_data': row[5]
-        } for row in results]
+        # Stream rows from a server-side cursor straight into the result dicts
+        rows = safe_query_iter(db_params, query, row_factory=tuple)
+        return [dict(zip(_CHUNK_DISTRIBUTION_KEYS, row)) for row in rows]
     except Exception as e:
         logger.error(f"Error getting chunk distribution: {e}")
         return []
 
+# Result keys, in the column order of the query below
+_BACKGROUND_JOB_KEYS = (
+    'job_id', 'application_name', 'proc_name', 'schedule_interval', 'hypertable_schema',
+    'hypertable_name', 'last_run_started', 'last_successful_finish', 'total_runs',
+    'total_successes', 'total_failures', 'total_crashes', 'last_run_duration_seconds'
+)
+
 def get_background_job_statistics(db_params):
     """Get statistics for TimescaleDB background jobs.
     
@@ -581,21 +611,7 @@ def get_background_job_statistics(db_params):
     
     try:
         results = execute_query(db_params, query)
-        return [{
-            'job_id': row[0],
-            'application_name': row[1],
-            'proc_name': row[2],
-            'schedule_interval': row[3],
-            'hypertable_schema': row[4],
-            'hypertable_name': row[5],
-            'last_run_started': row[6],
-            'last_successful_finish': row[7],
-            'total_runs': row[8],
-            'total_successes': row[9],
-            'total_failures': row[10],
-            'total_crashes': row[11],
-            'last_run_duration_seconds': row[12]
-        } for row in results]
+        return [dict(zip(_BACKGROUND_JOB_KEYS, row)) for row in results]
     except Exception as e:
         logger.error(f"Error getting background job statistics: {e}")
         return []
\ No newline at end of file
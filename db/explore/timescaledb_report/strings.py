@@ -4,28 +4,138 @@ String handling module for TimescaleDB Report Generator.
 This module handles loading and accessing strings from the TOML configuration file.
 """
 
+import bisect
+import functools
 import os
 import logging
-import toml
+import sys
+import threading
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+# Default paths to search for the config, in order
+_SEARCH_PATHS = (
+    # Current directory
+    Path("timescaledb_report_strings.toml"),
+    # Alongside the package
+    Path(__file__).parent / "timescaledb_report_strings.toml",
+    # In user config directory
+    Path(os.path.expanduser("~/.config/timescaledb_report/strings.toml")),
+    # System-wide config
+    Path("/etc/timescaledb_report/strings.toml"),
+)
 
 # Global configuration dictionary
 _config = None
 
+# Every node of the configuration keyed by its dotted path, for get_string
+_flat_config = None
+
+# Dotted paths of _flat_config in sorted order, for prefix queries
+_sorted_keys = []
+
+# (path, mtime_ns, size) of the file the configuration was loaded from, if any
+_loaded_from = None
+
+# Serializes the lazy first load between threads
+_config_lock = threading.Lock()
+
+# Marks a path that is absent from the configuration
+_MISSING = object()
+
+def _flatten(config):
+    """Map each dotted path in a nested configuration to its value
+
+    Both tables and leaf values get an entry, so any path that resolves in
+    the nested dict resolves here too.
+
+    Args:
+        config (MappingProxyType): Nested configuration, as built by ``_freeze``
+
+    Returns:
+        dict: Values keyed by interned dotted path
+    """
+    flat = {}
+    # Walk the tables with an explicit stack rather than recursing per level
+    stack = [('', config)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        prefix, table = pop()
+        for key, value in table.items():
+            path = sys.intern(prefix + key)
+            flat[path] = value
+            if isinstance(value, MappingProxyType):
+                push((path + '.', value))
+    return flat
+
+def _freeze(config):
+    """Copy a parsed configuration into read-only mappings with interned keys
+
+    Args:
+        config (dict): Nested configuration as parsed from TOML
+
+    Returns:
+        MappingProxyType: The same tables, safe to share between threads
+    """
+    return MappingProxyType({
+        sys.intern(key): _freeze(value) if isinstance(value, dict) else value
+        for key, value in config.items()
+    })
+
+def _set_config(config):
+    """Install a loaded configuration and its flattened lookup table"""
+    global _config, _flat_config, _sorted_keys
+    _config = config = _freeze(config)
+    _flat_config = _flatten(config)
+    _sorted_keys = sorted(_flat_config)
+    _format_cached.cache_clear()
+    return _config
+
 def get_config():
     """Get the configuration object, loading it if not already loaded.
 
     Returns:
-        dict: The configuration dictionary from the TOML file
+        MappingProxyType: The read-only configuration from the TOML file
     """
     global _config
     if _config is None:
-        load_config()
+        _load_once()
     return _config
 
+def _load_once():
+    """Load the configuration unless another thread got there first"""
+    with _config_lock:
+        # _flat_config is installed last, so it marks a completed load
+        if _flat_config is None:
+            load_config()
+
+def _file_signature(path):
+    """Identify a file's current contents by path, modification time and size"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+def _load_file(path):
+    """Parse a TOML strings file and install it, remembering where it came from"""
+    global _loaded_from
+    signature = _file_signature(path)
+    with open(path, 'rb') as f:
+        config = _set_config(tomllib.load(f))
+    _loaded_from = signature
+    return config
+
 def load_config(config_path=None):
     """Load the configuration from the TOML file.
 
+    Without an explicit path, a configuration already loaded from a file that
+    has not changed since is returned as is; a changed file is re-read
+    without searching the default locations again.
+
     Args:
         config_path (str, optional): Path to the TOML config file.
             If None, will look in default locations.
@@ -33,72 +143,190 @@ def load_config(config_path=None):
     Returns:
         dict: The loaded configuration
     """
-    global _config
-
-    # Default paths to search for the config
-    search_paths = [
-        # Current directory
-        Path("timescaledb_report_strings.toml"),
-        # Alongside the package
-        Path(__file__).parent / "timescaledb_report_strings.toml",
-        # In user config directory
-        Path(os.path.expanduser("~/.config/timescaledb_report/strings.toml")),
-        # System-wide config
-        Path("/etc/timescaledb_report/strings.toml")
-    ]
+    global _loaded_from
 
     # If a specific path is provided, try that first
     if config_path:
         try:
-            _config = toml.load(config_path)
-            return _config
+            return _load_file(config_path)
         except Exception as e:
             logging.warning(f"Failed to load config from {config_path}: {e}")
             # Continue to try default paths
+    elif _loaded_from is not None:
+        path = _loaded_from[0]
+        try:
+            if _file_signature(path) == _loaded_from:
+                return _config
+            return _load_file(path)
+        except Exception as e:
+            logging.warning(f"Failed to reload config from {path}: {e}")
+            # Search the default paths again
 
-    # Try each path in order
-    for path in search_paths:
+    # Try each default path in order
+    for path in _SEARCH_PATHS:
         if path.exists():
             try:
-                _config = toml.load(str(path))
-                return _config
+                return _load_file(path)
             except Exception as e:
                 logging.warning(f"Failed to load config from {path}: {e}")
 
     # If we get here, we couldn't load the config
     logging.warning("Could not find or load strings configuration. Using defaults.")
     # Initialize with an empty dict to avoid further load attempts
-    _config = {}
-    return _config
+    _loaded_from = None
+    return _set_config({})
 
-def get_string(path, default=None, **format_args):
+def get_string(path, default=None, *, fmt=None, **format_args):
     """Get a string from the configuration with formatting.
 
     Args:
         path (str): Dot-separated path to the string in the config
         default (str, optional): Default value if path not found
-        **format_args: Arguments to format the string with
+        fmt (Mapping, optional): Arguments to format the string with, passed
+            as one mapping; a reused mapping saves packing keyword arguments
+            into a new dict on every call
+        **format_args: Arguments to format the string with; override ``fmt``
 
     Returns:
-        str: The formatted string, or default if not found
+        str: The formatted string, or the formatted default if not found
     """
-    config = get_config()
-
-    # Navigate the config dictionary using the path
-    parts = path.split('.')
-    value = config
-    for part in parts:
-        if part in value:
-            value = value[part]
-        else:
-            return default if default is not None else path
-
-    # Format the string if format args are provided
-    if isinstance(value, str) and format_args:
-        try:
-            return value.format(**format_args)
-        except KeyError as e:
-            logging.warning(f"Missing format argument {e} for string {path}")
-            return value
+    # Load the configuration on first use; afterwards this is one global read
+    flat_config = _flat_config
+    if flat_config is None:
+        _load_once()
+        flat_config = _flat_config
+
+    # Look the path up in the flattened config
+    value = flat_config.get(path, _MISSING)
+    if value is _MISSING:
+        if default is None:
+            return path
+        value = default
+
+    if fmt is None:
+        fmt = format_args
+    elif format_args:
+        fmt = {**fmt, **format_args}
 
+    # Most reads pass no arguments; return before any type or content checks
+    if not fmt:
+        return value
+
+    # Format the string only if there is something to substitute;
+    # str.format parses the whole string even when it has no fields
+    if isinstance(value, str) and ('{' in value or '}' in value):
+        # Only plain scalars are memoized: other values (exceptions in
+        # particular) would be kept alive by the cache, and keying on the
+        # type keeps equal values like 1, 1.0 and True apart
+        if all(type(v) in _MEMO_TYPES for v in fmt.values()):
+            return _format_cached(path, value, tuple(sorted(
+                (k, type(v), v) for k, v in fmt.items())))
+        return _format(path, value, fmt)
+
+    return value
+
+def get_string_fast(path, default=None):
+    """Get a string from the configuration without formatting.
+
+    Equivalent to ``get_string`` without format arguments, but skips building
+    the keyword-argument dict on every call.
+
+    Args:
+        path (str): Dot-separated path to the string in the config
+        default (str, optional): Default value if path not found
+
+    Returns:
+        str: The configured string, the default, or the path if neither exists
+    """
+    flat_config = _flat_config
+    if flat_config is None:
+        _load_once()
+        flat_config = _flat_config
+
+    value = flat_config.get(path, _MISSING)
+    if value is _MISSING:
+        return path if default is None else default
     return value
+
+# (path, argument) pairs already warned about, so a problem is logged once
+_warned_missing = set()
+
+def _warn_once(path, key, message):
+    """Log a formatting problem with a string the first time it is seen"""
+    if (path, key) not in _warned_missing:
+        _warned_missing.add((path, key))
+        logging.warning(message)
+
+class _Placeholder:
+    """Stands in for a missing format argument and renders as its own field"""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __format__(self, spec):
+        return f"{{{self.key}:{spec}}}" if spec else f"{{{self.key}}}"
+
+    def __str__(self):
+        return f"{{{self.key}!s}}"
+
+    def __repr__(self):
+        return f"{{{self.key}!r}}"
+
+class _SafeMap(dict):
+    """Format arguments that leave a missing field as its placeholder instead of raising"""
+    __slots__ = ('path',)
+
+    def __missing__(self, key):
+        _warn_once(self.path, key, f"Missing format argument '{key}' for string {self.path}")
+        return _Placeholder(key)
+
+def _format(path, value, format_args):
+    """Format a configured string, leaving placeholders for missing arguments
+
+    A field the arguments can't satisfy otherwise, such as a bad format spec
+    or an attribute of a missing argument, leaves the string unformatted.
+    """
+    mapping = _SafeMap(format_args)
+    mapping.path = path
+    try:
+        return value.format_map(mapping)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+        _warn_once(path, None, f"Could not format string {path}: {e}")
+        return value
+
+# Argument types whose formatted results _format_cached may keep
+_MEMO_TYPES = frozenset((str, int, float, bool))
+
+@functools.lru_cache(maxsize=1024)
+def _format_cached(path, value, format_items):
+    """Memoized ``_format``; reports format the same strings with the same arguments repeatedly
+
+    ``format_items`` holds sorted ``(name, type, value)`` triples.
+    """
+    return _format(path, value, {k: v for k, _, v in format_items})
+
+def get_strings_under(prefix):
+    """Get every string in a section of the configuration.
+
+    Args:
+        prefix (str): Dot-separated path of the section, e.g. ``"report"``
+
+    Returns:
+        dict: Strings in the section and its subsections keyed by full dotted path
+    """
+    if _flat_config is None:
+        _load_once()
+    flat_config, keys = _flat_config, _sorted_keys
+
+    # Keys sharing a prefix are contiguous once sorted
+    prefix = prefix.rstrip('.') + '.'
+    strings = {}
+    for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+        key = keys[i]
+        if not key.startswith(prefix):
+            break
+        value = flat_config[key]
+        if not isinstance(value, MappingProxyType):
+            strings[key] = value
+    return strings